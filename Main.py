@@ -2,32 +2,53 @@
 """
 Temp & Relay Dashboard v2.6
 ──────────────────────────────────────────────────────────────
-• GUI: 2 temps, 6 cell voltages, SOC, SOH, charge-trend light,
+• GUI: 2 temps, 6 cell voltages, SOC, SOH, charge-trend light (LSQ dV/dt + ETA),
         4 relay buttons, user-settable battery target °C
 • Auto-Pilot logic:
         – heater / solenoid / pump follow user set-point reliably
+        – --controller=mpc (or BMS_CONTROLLER=mpc): model-predictive
+          heater / pump plan from thermal_model.json instead of
+          bang-bang (python sim_autopilot.py to compare / fit)
+• Alarm / interlock rules from alarm_rules.json (alarms.py)
+• Anomaly detection (anomaly.py): sensor dropout, stuck values,
+  outliers and sudden steps; heater off while a temperature is lost
 • Excel logging on Auto-Pilot start/stop
 • Live temp graph window (battery + heater)
 • Live 6-cell battery window
 • NEW: Displays Pack Voltage under graph
+• Fast start: matplotlib / openpyxl load after the window is up
+  (python bench_startup.py for the import-time report)
+• Tap channels calibrated + filtered (adc_calibration.json)
+• Serial link on an asyncio loop (serial_async.py): relay commands
+  are queued and confirmed by the board's ACK
+• Frames carry the board's seq + millis(): time axes use acquisition
+  time, Latency window shows board → host → screen histograms
+• Every Auto-Pilot session also stores all frames compressed
+  (session_*.bmt, telemetry_codec.read_telemetry to load)
+• --http[=PORT] (or BMS_HTTP=PORT): live page, /metrics (Prometheus),
+  /api/state and /ws on 127.0.0.1 (metrics_server.py)
+• --worker (or BMS_WORKER=1): acquisition, analytics and Auto-Pilot
+  run in a separate process, frames arrive via shared memory
 ──────────────────────────────────────────────────────────────
-pip install pyserial matplotlib openpyxl
+pip install pyserial numpy matplotlib openpyxl
 """
 
-import os, sys, time, datetime, threading, queue, serial, tkinter as tk
+import os, sys, math, time, datetime, threading, queue, logging, serial, tkinter as tk
 from tkinter import ttk, messagebox
-from collections import deque
-from matplotlib.figure import Figure
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from openpyxl import Workbook
-from temp_graph_windows import DualTempGraph
-from cell_monitor_window import run_monitor, push_cell_data
+import numpy as np
+from cell_monitor_window import run_monitor
+from acquisition import Pipeline, AcquisitionProcess, STATE_DTYPE, TREND_NAME
+from control import CONTROLLERS
+from serial_async import SerialHub
+from scheduler import FrameScheduler, HIGH, NORMAL
+from bus import Bus, FRAMES, RELAY, ALARMS, SESSION, RelayEvent, AlarmEvent, SessionEvent
+from frame import Frame, FrameRing, RecordLog
+from timing import LatencyHistogram
+from telemetry_codec import TelemetryWriter, flat_columns
 
 PORT       = "/dev/cu.usbmodem212201"
 BAUD       = 115200
 REFRESH_MS = 40
-PACK_MAX   = 25.2
-CELL_FULL  = 4.20
 LOG_DIR    = "/Users/princed/Desktop/DATA/"
 
 RELAYS = [("Heater", 1),
@@ -35,23 +56,44 @@ RELAYS = [("Heater", 1),
           ("Pump", 3),
           ("LOAD", 4)]
 
-TREND_WINDOW = 30
-TREND_THRESH = 0.01
+# acquisition in its own process (shared-memory frames) instead of a thread
+USE_WORKER = "--worker" in sys.argv or os.environ.get("BMS_WORKER") == "1"
 
-def serial_reader(ser: serial.Serial, q: queue.Queue, stop_evt: threading.Event):
-    ser.reset_input_buffer()
-    while not stop_evt.is_set():
-        try:
-            line = ser.readline().decode(errors="ignore").strip()
-        except serial.SerialException as err:
-            q.put(("__ERR__", str(err))); break
-        if line.startswith("DATA"):
-            try:
-                _, *nums = line.split(',')
-                if len(nums) == 8:
-                    q.put(tuple(map(float, nums)))
-            except ValueError:
-                pass
+# local HTTP / WebSocket / Prometheus endpoint: --http, --http=PORT or BMS_HTTP=PORT (0 = off)
+HTTP_ARG = next((a.partition("=")[2] or "8765" for a in sys.argv if a == "--http" or a.startswith("--http=")),
+                os.environ.get("BMS_HTTP", "0"))
+HTTP_PORT = int(HTTP_ARG) if HTTP_ARG.isdigit() and int(HTTP_ARG) < 65536 else None   # None: invalid, see __main__
+
+# Auto-Pilot controller: "bangbang" or "mpc" (control.CONTROLLERS)
+CONTROLLER = next((a.partition("=")[2] for a in sys.argv if a.startswith("--controller=")),
+                  os.environ.get("BMS_CONTROLLER", "bangbang"))
+
+HISTORY = 300              # frames kept for the pack-voltage plot
+
+# Session log schema (one Excel column per field; NaN → empty cell)
+LOG_DTYPE = np.dtype([("t_s", "f8"), ("tBatt", "f8"), ("tHeat", "f8"),
+                      ("Heater", "u1"), ("Solenoid", "u1"), ("Pump", "u1"), ("LOAD", "u1"),
+                      ("PackV", "f8"), ("SOC%", "f8"), ("SOH%", "f8"), ("Charging", "?"),
+                      ("HeatStart", "f8"), ("Heat∆s", "f8"), ("dV/dt", "f8"), ("ETA_s", "f8"),
+                      ("Setpoint", "f8")])
+
+# Fixed-point scales for the compressed frame log (value × scale → integer)
+TELEMETRY_SCALES = {"t": 1000, "t_recv": 10000, "t_batt": 100, "t_heat": 100,
+                    "cells": 1000, "pack_v": 1000, "soc": 100, "soh": 100, "dvdt": 100000, "eta": 1}
+
+# Imported on first use (plot, temp window, Excel); warmed in the background
+HEAVY_IMPORTS = ("matplotlib.figure", "openpyxl")
+
+def log_alarm(ev: AlarmEvent):
+    (logging.warning if ev.active else logging.info)(
+        f"Alarm {'Active' if ev.active else 'Clear'}: {ev.label}")
+
+def warm_imports():
+    """Pre-import pure-Python heavy modules off the UI thread (Tk backends stay on it)."""
+    import importlib
+    for name in HEAVY_IMPORTS:
+        try: importlib.import_module(name)
+        except ImportError: pass
 
 class Dashboard(tk.Tk):
     def __init__(self):
@@ -83,7 +125,6 @@ class Dashboard(tk.Tk):
         self.trend_lbl = tk.Label(self, width=14, height=2, text="Trend",
                                   bg="grey80", font=("Helvetica", 11))
         self.trend_lbl.grid(row=2, column=0, pady=4)
-        self.pack_window = deque(maxlen=TREND_WINDOW)
 
         self.state = {pin: False for _, pin in RELAYS}
         self.btn = {}
@@ -97,11 +138,12 @@ class Dashboard(tk.Tk):
             self.btn[pin] = b
 
         self.setpoint_var = tk.DoubleVar(value=20.0)
+        self.setpoint = 20.0
         spf = ttk.LabelFrame(self, text="Target Battery Temp (°C)")
         spf.grid(row=2, column=1, padx=6, pady=4, sticky="n")
         sp_entry = ttk.Entry(spf, width=6, textvariable=self.setpoint_var, font=("Consolas", 12))
         sp_entry.pack(padx=4, pady=2)
-        sp_entry.bind("<Return>", lambda e: None)
+        self.setpoint_var.trace_add("write", lambda *_: self.send_setpoint())
 
         self.auto = False
         self.auto_btn = tk.Button(self, width=20, font=BIG,
@@ -109,50 +151,107 @@ class Dashboard(tk.Tk):
                                   command=self.toggle_auto)
         self.auto_btn.grid(row=3, column=0, columnspan=2, pady=6)
 
-        self.fig = Figure(figsize=(4,3), dpi=100)
-        self.ax = self.fig.add_subplot(111)
-        self.ax.set(title="Pack Voltage", xlabel="t (s)", ylabel="V"); self.ax.grid(True)
-        self.line, = self.ax.plot([], [], lw=1.8)
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
-        self.canvas.get_tk_widget().grid(row=0, column=2, rowspan=4, padx=6, pady=4)
+        # plot is built once the window is up (see build_plot)
+        self.canvas = self.temp_window = None
+        self.plot_holder = tk.Frame(self, width=400, height=300)
+        self.plot_holder.grid(row=0, column=2, rowspan=4, padx=6, pady=4)
 
         self.pack_voltage_var = tk.StringVar(value="--.- V")
         ttk.Label(self, textvariable=self.pack_voltage_var, font=("Helvetica", 14, "bold"))\
             .grid(row=4, column=2, pady=5)
 
-        try:
-            self.ser = serial.Serial(PORT, BAUD, timeout=0.1)
-            self.q, self.stop_evt = queue.Queue(), threading.Event()
-            threading.Thread(target=serial_reader, args=(self.ser, self.q, self.stop_evt), daemon=True).start()
-        except serial.SerialException as e:
-            messagebox.showwarning("Serial", f"Serial port error:\n{e}\nGUI will still run.")
-            self.ser = None
-            self.q, self.stop_evt = queue.Queue(), threading.Event()
+        self.alarm_var = tk.StringVar(value="Alarms: clear")
+        self.alarm_lbl = tk.Label(self, textvariable=self.alarm_var, bg="grey80",
+                                  font=("Helvetica", 11), wraplength=300)
+        self.alarm_lbl.grid(row=4, column=0, columnspan=2, pady=5)
+        tk.Button(self, text="Latency", command=self.open_latency).grid(row=5, column=0, columnspan=2, pady=(0, 6))
+        self.latency = LatencyHistogram()
+        self.link_dropped = 0      # pipeline's count of board frames lost on the link
+        self.bus = Bus()
+        self.bus.subscribe(ALARMS, log_alarm)
+        self.active_alarms = {}                       # name → label
 
         self.t0 = time.time()
-        self.time_buf, self.pack_buf = [], []
-        self.cell_buf = [[] for _ in range(6)]
-        self.wb = self.ws = None
-        self.log_rows = []
+        self.q = queue.SimpleQueue()                  # serial loop thread → Tk
+        self.hub = self.link = self.worker = self.pipeline = None
+        if USE_WORKER:
+            self.worker = AcquisitionProcess(PORT, BAUD, self.t0, controller=CONTROLLER)
+        else:
+            self.hub = SerialHub()
+            try:
+                self.link = self.hub.open(PORT, BAUD, self.q.put, lambda msg: self.q.put(("__ERR__", msg)))
+            except (serial.SerialException, OSError) as e:
+                messagebox.showwarning("Serial", f"Serial port error:\n{e}\nGUI will still run.")
+            self.pipeline = Pipeline(self.send_relay if self.link else None, self.t0, CONTROLLER)
+
+        self.history = FrameRing(HISTORY, STATE_DTYPE)
+        self.wb = self.ws = self.telemetry = None
+        self.log = RecordLog(LOG_DTYPE)
         self.heat_start = None
 
-        self.temp_window = DualTempGraph()
-        self.after(1000, run_monitor)
-        self.after(REFRESH_MS, self.update_gui)
+        self.metrics = None
+        if HTTP_PORT:
+            from metrics_server import MetricsServer
+            try:
+                self.metrics = MetricsServer(self.bus, self.pipeline_counters, port=HTTP_PORT)
+                self.title(f"{self.title()}  –  live data: {self.metrics.url}")
+            except OSError as e:
+                messagebox.showwarning("HTTP", f"Metrics server not started:\n{e}")
+
+        threading.Thread(target=warm_imports, daemon=True).start()
+        self.after(REFRESH_MS, self.build_plot)
+        self.after(1000, run_monitor, self.bus)
+        self.scheduler = FrameScheduler.for_widget(self)
+        self.scheduler.every(REFRESH_MS, self.update_gui, HIGH)
+        self.scheduler.every(50, self.bus.flush, NORMAL)
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
+    def build_plot(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        from temp_graph_windows import DualTempGraph
+
+        self.fig = Figure(figsize=(4,3), dpi=100)
+        self.ax = self.fig.add_subplot(111)
+        self.ax.set(title="Pack Voltage", xlabel="t (s)", ylabel="V"); self.ax.grid(True)
+        self.line, = self.ax.plot([], [], lw=1.8)
+        self.plot_holder.destroy()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self)
+        self.canvas.get_tk_widget().grid(row=0, column=2, rowspan=4, padx=6, pady=4)
+        self.temp_window = DualTempGraph(self.bus)
+
+    def command(self, *cmd):
+        """Relay / Auto-Pilot / set-point command to whoever runs the pipeline."""
+        if self.worker: self.worker.send(*cmd)
+        else:
+            self.pipeline.command(cmd)
+            self.handle_events(self.pipeline.drain())
+
     def toggle(self, pin: int, force=None):
-        self.state[pin] = force if force is not None else not self.state[pin]
-        on = self.state[pin]
+        self.command("relay", pin, force if force is not None else not self.state[pin])
+
+    def show_relay(self, pin: int, on: bool):
+        self.state[pin] = on
         name = next(n for n, p in RELAYS if p == pin)
+        self.bus.publish(RELAY, RelayEvent(pin, name, on))
         self.btn[pin].config(text=f"{name}\n{'ON' if on else 'OFF'}",
                              bg="spring green" if on else "light grey")
-        if self.ser:
-            try: self.ser.write(f"S,{pin},{int(on)}\n".encode())
-            except serial.SerialException as e: messagebox.showerror("Serial", str(e))
+
+    def send_relay(self, relay: int, on: bool):
+        self.hub.send_relay(self.link, relay, on, done=lambda ok: ok or self.q.put(
+            ("__WARN__", f"Relay {relay} → {'ON' if on else 'OFF'} not acknowledged by the board")))
+
+    def send_setpoint(self):
+        try:
+            self.setpoint = float(self.setpoint_var.get())
+        except (tk.TclError, ValueError):
+            return
+        self.command("setpoint", self.setpoint)
 
     def toggle_auto(self):
         self.auto = not self.auto
+        self.send_setpoint()
+        self.command("auto", self.auto)
         self.auto_btn.config(text="Disable Auto-Pilot" if self.auto else "Enable Auto-Pilot",
                              bg="pale green" if self.auto else "light blue")
         (self.start_session if self.auto else self.end_session)()
@@ -161,105 +260,142 @@ class Dashboard(tk.Tk):
         os.makedirs(LOG_DIR, exist_ok=True)
         ts = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
         self.xlsx_path = os.path.join(LOG_DIR, f"session_{ts}.xlsx")
+        from openpyxl import Workbook
         self.wb = Workbook(); self.ws = self.wb.active
-        self.ws.append(["t_s", "tBatt", "tHeat", "Heater", "Solenoid", "Pump", "LOAD",
-                        "PackV", "SOC%", "SOH%", "Charging", "HeatStart", "Heat∆s"])
-        self.log_rows.clear(); self.heat_start = None
+        self.ws.append(list(LOG_DTYPE.names))
+        self.log.clear(); self.heat_start = None
+        self.telemetry = TelemetryWriter(os.path.join(LOG_DIR, f"session_{ts}.bmt"),
+                                         flat_columns(STATE_DTYPE, TELEMETRY_SCALES))
+        self.bus.publish(SESSION, SessionEvent("start", self.xlsx_path))
 
     def end_session(self):
         if not self.wb: return
-        for r in self.log_rows: self.ws.append(r)
+        self.telemetry.close(); self.telemetry = None
+        for r in self.log.view().tolist():
+            self.ws.append([None if v != v else v for v in r])      # NaN → empty cell
         try: self.wb.save(self.xlsx_path)
         except PermissionError:
             messagebox.showwarning("Save", "Close the Excel file then disable again.")
         self.wb = self.ws = None
+        self.bus.publish(SESSION, SessionEvent("end", self.xlsx_path))
 
     def update_gui(self):
-        try:
-            while True:
-                item = self.q.get_nowait()
-                if item and item[0] == "__ERR__":
-                    messagebox.showerror("Serial", item[1]); self.on_close(); return
-
-                t_batt, t_heat, *cumulative = item
-                sorted_cum = sorted(cumulative)
-                cells = [sorted_cum[0]] + [sorted_cum[i] - sorted_cum[i - 1] for i in range(1, 6)]
-
-                self.tvars[0].set(f"{t_batt:4.1f}")
-                self.tvars[1].set(f"{t_heat:4.1f}")
-                for i, v in enumerate(cells): self.vvars[i].set(f"{v:.2f}")
-
-                pack_v = max(cumulative)
-                self.pack_voltage_var.set(f"{pack_v:.2f} V")
-
-                soc = max(0, min(pack_v / PACK_MAX, 1)) * 100
-                soh = max(0, min(sum(cells) / 6 / CELL_FULL, 1)) * 100
-                self.soc_var.set(f"{soc:5.1f} %")
-                self.soh_var.set(f"{soh:5.1f} %")
-
-                self.pack_window.append(pack_v)
-                if len(self.pack_window) == TREND_WINDOW:
-                    delta = self.pack_window[-1] - self.pack_window[0]
-                    if delta > TREND_THRESH: trend = "up"
-                    elif delta < -TREND_THRESH: trend = "down"
-                    else: trend = "flat"
-                    self.trend_lbl.config(
-                        text={"up": "Charging ↑", "down": "Discharging ↓", "flat": "Stable"}[trend],
-                        bg={"up": "pale green", "down": "light coral", "flat": "grey80"}[trend])
-
-                now = time.time() - self.t0
-                self.time_buf.append(now); self.pack_buf.append(pack_v)
-                for i in range(6): self.cell_buf[i].append(cells[i])
-                if len(self.time_buf) > 300:
-                    self.time_buf, self.pack_buf = self.time_buf[-300:], self.pack_buf[-300:]
-                    for i in range(6): self.cell_buf[i] = self.cell_buf[i][-300:]
-                self.line.set_data(self.time_buf, self.pack_buf)
-                self.ax.relim(); self.ax.autoscale_view(); self.canvas.draw_idle()
-
-                self.temp_window.add_data(t_batt, t_heat)
-                push_cell_data(cumulative)
-
-                if self.auto:
-                    try:
-                        S = float(self.setpoint_var.get())
-                    except (tk.TclError, ValueError):
-                        S = 20.0
-                    h_pin, s_pin, p_pin = 1, 2, 3
-                    heater_on = (t_batt < S) and (t_heat <= S + 20)
-                    heater_off = (t_batt >= S) or (t_heat >= S + 20)
-                    pump_on = (t_batt < S) and (t_heat >= t_batt + 10)
-                    pump_off = (t_batt >= S)
-
-                    if heater_on: self.toggle(h_pin, True)
-                    elif heater_off: self.toggle(h_pin, False)
-                    if pump_on: self.toggle(s_pin, True); self.toggle(p_pin, True)
-                    elif pump_off: self.toggle(s_pin, False); self.toggle(p_pin, False)
-
-                    if self.state[h_pin] and self.heat_start is None:
-                        self.heat_start = now
-                    heat_delta = (now - self.heat_start) if (self.heat_start and not self.state[h_pin]) else ""
-
-                    self.log_rows.append([now, t_batt, t_heat,
-                                          int(self.state[1]), int(self.state[2]), int(self.state[3]), int(self.state[4]),
-                                          pack_v, soc, soh,
-                                          trend == "up",
-                                          self.heat_start if self.heat_start else "",
-                                          heat_delta])
-        except queue.Empty:
-            pass
-        self.after(REFRESH_MS, self.update_gui)
+        if self.worker:
+            recs = self.worker.read()
+            self.handle_events(self.worker.drain())
+        else:
+            batch = []
+            try:
+                while True:
+                    item = self.q.get_nowait()
+                    if item[0] == "__ERR__":
+                        messagebox.showerror("Serial", item[1]); self.on_close(); return
+                    if item[0] == "__WARN__":
+                        self.handle_events([("error", item[1])]); continue
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            if not batch: return
+            # calibration, reconstruction, trend, alarms and Auto-Pilot for the whole batch
+            recs = self.pipeline.process(batch)
+            self.handle_events(self.pipeline.drain())
+        if not len(recs): return
+
+        self.history.extend(recs)
+        if self.telemetry: self.telemetry.append(recs)
+        for rec in recs:
+            frame = Frame.from_record(rec)
+            self.bus.publish(FRAMES, frame)             # one immutable frame, fanned out to every window
+            if self.auto:
+                # relay states as the pipeline left them after this frame, not after the batch
+                now, on = frame.t, [bool(rec["relays"] >> (pin - 1) & 1) for _, pin in RELAYS]
+                if on[0] and self.heat_start is None:
+                    self.heat_start = now
+                heat_delta = (now - self.heat_start) if (self.heat_start and not on[0]) else math.nan
+                self.log.append((now, frame.t_batt, frame.t_heat, *on,
+                                 frame.pack_v, rec["soc"], rec["soh"],
+                                 rec["trend"] > 0,
+                                 self.heat_start if self.heat_start else math.nan,
+                                 heat_delta,
+                                 rec["dvdt"], rec["eta"] if math.isfinite(rec["eta"]) else math.nan,
+                                 self.setpoint))
+
+        # widgets show the newest frame only
+        last = recs[-1]
+        self.tvars[0].set(f"{last['t_batt']:4.1f}")
+        self.tvars[1].set(f"{last['t_heat']:4.1f}")
+        for i, v in enumerate(last["cells"]): self.vvars[i].set(f"{v:.2f}")
+        self.pack_voltage_var.set(f"{last['pack_v']:.2f} V")
+        self.soc_var.set(f"{last['soc']:5.1f} %")
+        self.soh_var.set(f"{last['soh']:5.1f} %")
+        if last["ready"]:
+            trend, eta = TREND_NAME[int(last["trend"])], float(last["eta"])
+            eta_txt = f"\n~{eta / 60:.0f} min to {'full' if trend == 'up' else 'empty'}" \
+                if math.isfinite(eta) else ""
+            self.trend_lbl.config(
+                text={"up": "Charging ↑", "down": "Discharging ↓", "flat": "Stable"}[trend] + eta_txt,
+                bg={"up": "pale green", "down": "light coral", "flat": "grey80"}[trend])
+
+        # plot straight from the record ring: no per-sample lists
+        if self.canvas:
+            h = self.history.view()
+            self.line.set_data(h["t"], h["pack_v"])
+            self.ax.relim(); self.ax.autoscale_view(); self.canvas.draw_idle()
+        self.record_latency(recs)
+
+    def record_latency(self, recs):
+        t_disp = time.time() - self.t0
+        self.latency.add("transport", recs["t_recv"] - recs["t"])
+        self.latency.add("display", t_disp - recs["t_recv"])
+        self.latency.add("total", t_disp - recs["t"])
+
+    def pipeline_counters(self) -> dict:
+        return {"frames_total": self.bus.published.get("frames", 0),
+                "link_dropped_frames_total": self.link_dropped,
+                "latency_p50_seconds": self.latency.percentile("total", 50),
+                "latency_p95_seconds": self.latency.percentile("total", 95),
+                "scheduler_overruns_total": self.scheduler.overruns,
+                "shm_dropped_frames_total": self.worker.ring.dropped if self.worker else 0}
+
+    def open_latency(self):
+        from latency_window import LatencyWindow
+        LatencyWindow(self.latency, lambda: self.link_dropped)
+
+    def handle_events(self, events):
+        alarms = False
+        for kind, *args in events:
+            if kind == "relay":
+                self.show_relay(*args)
+            elif kind == "alarm":
+                name, label, active = args
+                if active: self.active_alarms[name] = label
+                else: self.active_alarms.pop(name, None)
+                self.bus.publish(ALARMS, AlarmEvent(name, label, active)); alarms = True
+            elif kind == "dropped":
+                self.link_dropped = args[0]
+            elif kind == "error":
+                messagebox.showerror("Serial", args[0])
+        if alarms:
+            labels = list(self.active_alarms.values())
+            self.alarm_var.set("Alarms: " + (", ".join(labels) if labels else "clear"))
+            self.alarm_lbl.config(bg="light coral" if labels else "grey80")
 
     def on_close(self):
         if self.auto: self.end_session()
-        self.stop_evt.set()
-        try:
-            self.ser and self.ser.close()
-        except Exception: pass
+        if self.worker: self.worker.stop()
+        if self.hub: self.hub.close()
+        if self.metrics: self.metrics.close()
         self.destroy()
 
 if __name__ == "__main__":
-    try:
-        import serial, matplotlib, openpyxl
-    except ModuleNotFoundError as err:
-        sys.exit("Install:\n  pip install pyserial matplotlib openpyxl\n" + str(err))
+    import importlib.util
+    missing = [m for m in ("serial", "numpy", "matplotlib", "openpyxl") if not importlib.util.find_spec(m)]
+    if missing:
+        sys.exit("Install:\n  pip install pyserial numpy matplotlib openpyxl\nMissing: " + ", ".join(missing))
+    if CONTROLLER not in CONTROLLERS:
+        sys.exit(f"Unknown controller {CONTROLLER!r} (choose from {', '.join(CONTROLLERS)})")
+    if HTTP_PORT is None:
+        sys.exit(f"Invalid HTTP port {HTTP_ARG!r} (--http=PORT / BMS_HTTP=PORT, 0-65535)")
+    logging.basicConfig(filename="alarm.log", level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
     Dashboard().mainloop()
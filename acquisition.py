@@ -0,0 +1,334 @@
+"""
+Acquisition + analytics pipeline
+──────────────────────────────────────────────────────────────
+• Pipeline: raw serial frames → device clock sync (timing.py)
+  → calibration / filtering → cell reconstruction → trend →
+  alarms / anomalies (anomaly.py) / tap faults / interlock → Auto-Pilot
+  (control.py: bang-bang or model-predictive),
+  one batch at a time; output is a STATE_DTYPE record array
+  plus a list of events:
+      ("alarm", name, label, active)   ("relay", pin, on)
+      ("error", message)               ("dropped", total)
+  ("dropped": running count of board frames lost on the link,
+  from gaps in the device sequence number)
+• Runs either on the Tk thread (default) or in a worker process
+  (AcquisitionProcess, `Main.py --worker` / BMS_WORKER=1) so
+  parsing and control get their own core and GIL
+• Worker → GUI frames go through a shared-memory ring with a
+  per-slot seqlock: the writer marks a slot odd while filling
+  it, the reader keeps a copy only if the slot's sequence was
+  even and unchanged across the copy – no locks, and the GUI
+  never blocks the worker
+• GUI → worker commands (relays, Auto-Pilot, set-point) and
+  worker → GUI events use small multiprocessing queues
+──────────────────────────────────────────────────────────────
+"""
+
+import math, queue, time, warnings
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+import serial
+
+from cells import reconstruct_cells
+from signal_conditioning import SignalConditioner
+from trend import TrendEstimator
+from alarms import AlarmEngine
+from control import make_controller, HEATER, PUMP
+from frame import FRAME_DTYPE, NUM_CELLS, batch_records
+from timing import ClockSync
+from anomaly import AnomalyDetector, bms_channels
+
+PACK_MAX  = 25.2
+PACK_MIN  = 18.0           # 6 × 3.0 V, "empty" for time-to-empty
+CELL_FULL = 4.20
+TREND_WINDOW_S = 3.0       # regression window (s)
+TREND_THRESH   = 0.01      # V change across the window to call a trend
+RING_CAPACITY  = 4096      # frames held in shared memory (~minutes at 20 Hz)
+
+TREND_CODE = {"down": -1, "flat": 0, "up": 1}
+TREND_NAME = {v: k for k, v in TREND_CODE.items()}
+
+# Raw frame: (dev_seq, dev_ms, t_recv, t_batt, t_heat, tap0..tap5)
+RAW_COLS = 11
+
+# FRAME_DTYPE (t = acquisition time) + receive time + per-frame analytics
+STATE_DTYPE = np.dtype(FRAME_DTYPE.descr + [("dev_seq", "i8"), ("t_recv", "f8"),
+                                            ("soc", "f8"), ("soh", "f8"), ("dvdt", "f8"),
+                                            ("eta", "f8"), ("trend", "i1"), ("ready", "?"),
+                                            ("relays", "u1")])       # bit pin-1 = relay on after this frame
+
+
+def parse_line(line: str, t_recv: float):
+    """'DATA,seq,ms,tb,th,a0..a5' (or the older 'DATA,tb,th,a0..a5') → raw frame tuple, else None."""
+    if not line.startswith("DATA"):
+        return None
+    try:
+        _, *nums = line.split(',')
+        if len(nums) == 10:
+            return (float(nums[0]), float(nums[1]), t_recv, *map(float, nums[2:]))
+        if len(nums) == 8:                          # firmware without device timestamps
+            return (math.nan, math.nan, t_recv, *map(float, nums))
+    except ValueError:
+        pass
+    return None
+
+
+class Pipeline:
+    def __init__(self, send=None, t0: float = None, controller: str = "bangbang"):
+        """send(relay, on): passes a relay command to the board (None → no board)."""
+        self.send = send
+        self.controller_name = controller
+        self.t0 = time.time() if t0 is None else t0
+        self.conditioner = SignalConditioner.from_file()
+        self.pack_trend = TrendEstimator(TREND_WINDOW_S)
+        self.alarms = AlarmEngine({"cell_v": NUM_CELLS, "temp": 2, "pack_v": 1, "rate": 1, "imbalance": 1},
+                                  app="dashboard")
+        self.controller = make_controller(controller)
+        self.anomaly = AnomalyDetector(bms_channels(NUM_CELLS))
+        self.clock = ClockSync()
+        self.dev_seq = None
+        self.tap_fault = np.zeros(NUM_CELLS, dtype=bool)
+        self.dev_dropped = 0        # frames the board sent that never arrived (seq gaps)
+        self.relays = {pin: False for pin in (1, 2, 3, 4)}
+        self.auto, self.setpoint = False, 20.0
+        self.seq = 0
+        self.events = []
+
+    def drain(self) -> list:
+        ev, self.events = self.events, []
+        return ev
+
+    def command(self, cmd: tuple):
+        kind, *args = cmd
+        if kind == "relay":   self.set_relay(*args)
+        elif kind == "auto":
+            if args[0] and not self.auto:        # fresh dwell timers (and refitted model) per run
+                self.controller = make_controller(self.controller_name)
+            self.auto = bool(args[0])
+        elif kind == "setpoint": self.setpoint = float(args[0])
+
+    def relay_mask(self) -> int:
+        return sum(1 << (pin - 1) for pin, on in self.relays.items() if on)
+
+    def set_relay(self, pin: int, on: bool):
+        if self.relays[pin] == on:
+            return
+        self.relays[pin] = on
+        self.events.append(("relay", pin, on))
+        if self.send:
+            try: self.send(pin, on)
+            except serial.SerialException as e: self.events.append(("error", str(e)))
+
+    def process(self, batch) -> np.ndarray:
+        """Raw frames (n, RAW_COLS) → STATE_DTYPE records; events queue up in self.events."""
+        frames = np.asarray(batch, dtype=float)
+        n = len(frames)
+        t_acq = self.timestamps(frames[:, 0], frames[:, 1], frames[:, 2])
+        # sentinel / out-of-range temperatures become NaN before anything compares them
+        frames[:, 3:5] = self.anomaly.clean(frames[:, 3:5], slice(NUM_CELLS, None))
+        taps = self.conditioner.process(frames[:, 5:])
+        cells, pack, tap_fault = reconstruct_cells(taps)
+        recs = np.zeros(n, STATE_DTYPE)
+        base = batch_records(self.seq, t_acq - self.t0, frames[:, 3], frames[:, 4], cells, pack)
+        for name in FRAME_DTYPE.names:
+            recs[name] = base[name]
+        recs["dev_seq"] = np.nan_to_num(frames[:, 0], nan=-1)
+        recs["t_recv"] = frames[:, 2] - self.t0
+        self.seq += n
+        recs["soc"] = np.clip(pack / PACK_MAX, 0, 1) * 100
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)         # all-NaN row → NaN
+            recs["soh"] = np.clip(np.nanmean(cells, axis=1) / CELL_FULL, 0, 1) * 100
+
+        for rec, c, fault, (t_batt, t_heat) in zip(recs, cells, tap_fault, frames[:, 3:5]):
+            now, pack_v = float(rec["t"]), float(rec["pack_v"])
+            self.pack_trend.add(now, pack_v)
+            trend = self.pack_trend.trend(TREND_THRESH / TREND_WINDOW_S)
+            dvdt = self.pack_trend.slope
+            eta = self.pack_trend.eta(PACK_MAX if trend == "up" else PACK_MIN) \
+                if trend != "flat" else math.inf
+            rec["dvdt"], rec["eta"], rec["trend"] = dvdt, eta, TREND_CODE[trend]
+            rec["ready"] = self.pack_trend.ready()
+
+            for name, label, active in self.alarms.evaluate({
+                    "cell_v": c, "temp": (t_batt, t_heat), "pack_v": pack_v, "rate": dvdt,
+                    "imbalance": np.nanmax(c) - np.nanmin(c) if np.isfinite(c).any() else math.nan}):
+                self.events.append(("alarm", name, label, active))
+            # stuck only counts while a channel should be moving: cells while the
+            # pack trends, battery while heat is pumped in, heater while it heats
+            heating = self.relays[HEATER]
+            moving = np.r_[np.full(NUM_CELLS, trend != "flat"),
+                           heating and self.relays[PUMP], heating]
+            for ev in self.anomaly.update(np.concatenate((c, (t_batt, t_heat))), moving):
+                self.events.append(("alarm", *ev))
+            for i in np.flatnonzero(fault != self.tap_fault):
+                self.events.append(("alarm", f"sense_fault[{i}]", f"Tap {i + 1} sense lead fault", bool(fault[i])))
+            self.tap_fault = fault
+            # heater off on an interlock alarm, or when a cell / temperature can't be
+            # trusted (dropout, out of range, sense lead fault)
+            lockout = self.alarms.interlock() or self.anomaly.any_dropout() or fault.any()
+            if lockout:
+                self.set_relay(HEATER, False)
+
+            if self.auto:
+                for pin, on in self.controller.step(t_batt, t_heat, self.setpoint, lockout, now).items():
+                    self.set_relay(pin, on)
+            rec["relays"] = self.relay_mask()
+        return recs
+
+    def timestamps(self, dev_seq, dev_ms, t_recv) -> np.ndarray:
+        """Host-clock acquisition times; receive time for frames without a device stamp."""
+        t_acq = t_recv.copy()
+        dropped = self.dev_dropped
+        for i in np.flatnonzero(np.isfinite(dev_ms)):
+            seq = int(dev_seq[i])
+            if self.dev_seq is not None and seq > self.dev_seq + 1:
+                self.dev_dropped += seq - self.dev_seq - 1
+            self.dev_seq = seq
+            t_acq[i] = self.clock.to_host(dev_ms[i], t_recv[i])
+        if self.dev_dropped != dropped:
+            self.events.append(("dropped", self.dev_dropped))
+        return t_acq
+
+
+# ── shared-memory seqlock ring ─────────────────────────────────
+class ShmRing:
+    """Single-writer / single-reader ring of STATE_DTYPE records in shared memory.
+
+    Layout: [written u8][slot seq u8 × capacity][records × capacity].
+    Slot for frame n holds seq 2n+2 once complete (2n+1 while being written).
+    """
+
+    def __init__(self, capacity: int = RING_CAPACITY, name: str = None, dtype=STATE_DTYPE):
+        self.capacity, self.dtype = capacity, np.dtype(dtype)
+        size = 8 + 8 * capacity + self.dtype.itemsize * capacity
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        buf = self.shm.buf
+        self._written = np.ndarray((1,), np.uint64, buf, 0)
+        self._seqs = np.ndarray((capacity,), np.uint64, buf, 8)
+        self._recs = np.ndarray((capacity,), self.dtype, buf, 8 + 8 * capacity)
+        if self.owner:
+            self._written[0] = 0; self._seqs[:] = 0
+        self._next = 0               # reader: next frame index wanted
+        self.dropped = 0             # reader: frames overwritten before they were read
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    # writer side
+    def write(self, recs: np.ndarray):
+        n = int(self._written[0])
+        for rec in recs:
+            slot = n % self.capacity
+            self._seqs[slot] = 2 * n + 1
+            self._recs[slot] = rec
+            self._seqs[slot] = 2 * n + 2
+            n += 1
+            self._written[0] = n
+
+    # reader side
+    def read(self) -> np.ndarray:
+        """Every complete frame written since the last read (oldest may be dropped)."""
+        w = int(self._written[0])
+        if w - self._next > self.capacity:
+            self.dropped += w - self.capacity - self._next
+            self._next = w - self.capacity
+        out = np.empty(w - self._next, self.dtype)
+        k = 0
+        for n in range(self._next, w):
+            slot = n % self.capacity
+            s1 = int(self._seqs[slot])
+            rec = self._recs[slot].copy()
+            if s1 == 2 * n + 2 and int(self._seqs[slot]) == s1:
+                out[k] = rec; k += 1
+            else:
+                self.dropped += 1            # lapped by the writer mid-copy
+        self._next = w
+        return out[:k]
+
+    def close(self):
+        self._written = self._seqs = self._recs = None      # release buffer views
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(shm_name, capacity, port, baud, cmd_q, evt_q, stop_evt, t0, controller):
+    ring = ShmRing(capacity, shm_name)
+    try:
+        ser = serial.Serial(port, baud, timeout=0.05)
+    except serial.SerialException as e:
+        evt_q.put(("error", f"Serial port error:\n{e}")); ser = None
+    try:
+        pipe = Pipeline((lambda pin, on: ser.write(f"S,{pin},{int(on)}\n".encode())) if ser else None,
+                        t0, controller)
+    except Exception as e:                   # the GUI would otherwise just never see data
+        evt_q.put(("error", f"Acquisition worker failed to start:\n{e}"))
+        if ser: ser.close()
+        ring.close(); return
+    try:
+        if ser: ser.reset_input_buffer()
+        while not stop_evt.is_set():
+            try:
+                while True: pipe.command(cmd_q.get_nowait())
+            except queue.Empty:
+                pass
+            if ser is None:
+                time.sleep(0.05)
+            else:
+                batch = []
+                try:
+                    frame = parse_line(ser.readline().decode(errors="ignore").strip(), time.time())
+                    if frame: batch.append(frame)
+                    while ser.in_waiting:
+                        frame = parse_line(ser.readline().decode(errors="ignore").strip(), time.time())
+                        if frame: batch.append(frame)
+                except serial.SerialException as e:
+                    evt_q.put(("error", str(e))); break
+                if batch:
+                    ring.write(pipe.process(batch))
+            for ev in pipe.drain():
+                evt_q.put(ev)
+    finally:
+        if ser:
+            try: ser.close()
+            except Exception: pass
+        ring.close()
+
+
+class AcquisitionProcess:
+    """GUI-side handle: starts the worker, reads its frames, sends commands."""
+
+    def __init__(self, port: str, baud: int, t0: float, capacity: int = RING_CAPACITY,
+                 controller: str = "bangbang"):
+        ctx = mp.get_context("spawn")            # no Tk state copied into the child
+        self.ring = ShmRing(capacity)
+        self.cmd_q, self.evt_q, self.stop_evt = ctx.Queue(), ctx.Queue(), ctx.Event()
+        self.proc = ctx.Process(target=_worker_main, name="bms-acquisition", daemon=True,
+                                args=(self.ring.name, capacity, port, baud,
+                                      self.cmd_q, self.evt_q, self.stop_evt, t0, controller))
+        self.proc.start()
+
+    def send(self, *cmd):
+        self.cmd_q.put(cmd)
+
+    def read(self) -> np.ndarray:
+        return self.ring.read()
+
+    def drain(self) -> list:
+        out = []
+        try:
+            while True: out.append(self.evt_q.get_nowait())
+        except queue.Empty:
+            pass
+        return out
+
+    def stop(self, timeout: float = 1.0):
+        self.stop_evt.set()
+        self.proc.join(timeout)
+        if self.proc.is_alive():
+            self.proc.terminate()
+        self.ring.close()
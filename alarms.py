@@ -0,0 +1,123 @@
+"""
+Rule-based alarm / interlock engine
+──────────────────────────────────────────────────────────────
+• Rules are declarative (alarm_rules.json):
+      {"name": "cell_ov", "metric": "cell_v", "op": ">", "limit": 4.25,
+       "clear": 4.20, "debounce": 3, "severity": "interlock",
+       "label": "Cell {ch} over-voltage"}
+  – metric "cell_v" expands to every channel, "cell_v[2]" picks one
+  – optional "ref" metric: compares (metric − ref) against limit
+  – "clear" gives hysteresis, "debounce" = frames before a change
+  – optional "app": "dashboard" | "gui" (or a list); the file is
+    shared by Main.py and gui.py, whose metrics differ, and each
+    engine only loads the rules for its own app (no key = all)
+• Rules compile to flat index / threshold arrays, so one frame
+  is evaluated for all rules with a handful of NumPy ops
+• A rule for this app whose metric isn't in the engine's layout
+  is skipped with a logged warning – a typo in an interlock
+  must never disappear silently
+──────────────────────────────────────────────────────────────
+"""
+
+import json, logging, os, re
+import numpy as np
+
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alarm_rules.json")
+
+_OPS = {">": (1, True), ">=": (1, False), "<": (-1, True), "<=": (-1, False)}
+_METRIC_RE = re.compile(r"^(\w+)(?:\[(\d+)\])?$")
+
+
+def load_rules(path: str = RULES_FILE, app: str = None) -> list:
+    """Rules from the JSON file; with app, only those without an "app" key or naming it."""
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        cfg = json.load(f)
+    rules = cfg.get("rules", []) if isinstance(cfg, dict) else cfg
+    if app is None:
+        return rules
+    scope = lambda r: [r["app"]] if isinstance(r.get("app"), str) else r.get("app", [app])
+    return [r for r in rules if app in scope(r)]
+
+
+class AlarmEngine:
+    def __init__(self, layout: dict, rules: list = None, app: str = None):
+        """layout: metric name → channel count, e.g. {"cell_v": 6, "temp": 2};
+        rules default to alarm_rules.json's rules for app."""
+        self.slices, n = {}, 0
+        for name, width in layout.items():
+            self.slices[name] = (n, width); n += width
+        self._x = np.zeros(n + 1)            # last slot is a constant 0 for "no ref"
+        self._compile(load_rules(app=app) if rules is None else rules)
+
+    def _channels(self, metric: str):
+        m = _METRIC_RE.match(metric.replace(" ", ""))
+        if not m or m.group(1) not in self.slices:
+            return []
+        start, width = self.slices[m.group(1)]
+        if m.group(2) is not None:
+            ch = int(m.group(2))
+            return [(start + ch, ch)] if ch < width else []
+        return [(start + i, i) for i in range(width)]
+
+    def _compile(self, rules):
+        idx, ref, sign, strict, lim, clr, deb = [], [], [], [], [], [], []
+        self.names, self.labels, self.severity = [], [], []
+        zero = len(self._x) - 1
+        for r in rules:
+            chans = self._channels(r["metric"])
+            ref_ch = self._channels(r["ref"]) if r.get("ref") else [(zero, 0)]
+            if not chans or len(ref_ch) != 1:
+                why = f"metric {r['metric']!r} is not" if not chans else f"ref {r['ref']!r} is not one channel"
+                logging.warning(f"Alarm rule {r.get('name', '?')!r} skipped: {why} in layout "
+                                f"{', '.join(f'{k}[{w}]' for k, (_, w) in self.slices.items())}")
+                continue
+            s, st = _OPS[r.get("op", ">")]
+            for i, ch in chans:
+                idx.append(i); ref.append(ref_ch[0][0]); sign.append(s); strict.append(st)
+                lim.append(s * r["limit"]); clr.append(s * r.get("clear", r["limit"]))
+                deb.append(max(int(r.get("debounce", 1)), 1))
+                suffix = f"[{ch}]" if len(chans) > 1 else ""
+                self.names.append(r["name"] + suffix)
+                self.labels.append(r.get("label", r["name"]).replace("{ch}", str(ch + 1)))
+                self.severity.append(r.get("severity", "alarm"))
+        self._idx, self._ref = np.array(idx, dtype=np.intp), np.array(ref, dtype=np.intp)
+        self._sign, self._strict = np.array(sign, dtype=float), np.array(strict, dtype=bool)
+        self._lim, self._clr = np.array(lim, dtype=float), np.array(clr, dtype=float)
+        self._deb = np.array(deb, dtype=np.int64)
+        self._interlock = np.array([s == "interlock" for s in self.severity], dtype=bool)
+        self.active = np.zeros(len(idx), dtype=bool)
+        self._cnt = np.zeros(len(idx), dtype=np.int64)
+
+    def evaluate(self, metrics: dict) -> list:
+        """
+        metrics: metric name → scalar or per-channel array for this frame.
+        Updates self.active and returns [(name, label, now_active), …] for changes.
+        """
+        for name, val in metrics.items():
+            sl = self.slices.get(name)
+            if sl: self._x[sl[0]:sl[0] + sl[1]] = val
+        y = self._sign * (self._x[self._idx] - self._x[self._ref])
+        thr = np.where(self.active, self._clr, self._lim)
+        with np.errstate(invalid="ignore"):
+            cond = np.where(self._strict, y > thr, y >= thr)      # NaN → False
+        self._cnt = np.where(cond != self.active, self._cnt + 1, 0)
+        flip = self._cnt >= self._deb
+        if not flip.any():
+            return []
+        self.active ^= flip
+        self._cnt[flip] = 0
+        return [(self.names[i], self.labels[i], bool(self.active[i])) for i in np.flatnonzero(flip)]
+
+    def is_active(self, name: str) -> bool:
+        return bool(self.active[self.names.index(name)])
+
+    def any_active(self) -> bool:
+        return bool(self.active.any())
+
+    def interlock(self) -> bool:
+        return bool((self.active & self._interlock).any())
+
+    def active_labels(self) -> list:
+        return [self.labels[i] for i in np.flatnonzero(self.active)]
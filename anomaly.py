@@ -0,0 +1,114 @@
+"""
+Streaming anomaly detection
+──────────────────────────────────────────────────────────────
+• One update() per frame, vectorized across all channels
+  (cells + temperatures), O(1) state per channel:
+      dropout – NaN / firmware sentinel (-99.99) / outside the
+                channel's physical range
+      stuck   – value unchanged for `stuck_frames` frames while
+                the caller says it should be moving (heater on,
+                pack charging …); 0 frames = off for that channel.
+                A steady, quantized reading (DS18B20 at 0.5 °C) is
+                not a fault on its own
+      zscore  – |x − EWMA mean| > z_limit × EWMA std
+      step    – |x − previous| > step_limit in one frame
+• Instantaneous detections (zscore, step) stay active for
+  HOLD_FRAMES so a single spike shows up and then clears
+• update() returns (name, label, active) transitions – the same
+  shape as AlarmEngine.evaluate, so they go out on the ALARMS
+  topic and into alarm.log unchanged
+──────────────────────────────────────────────────────────────
+"""
+
+import numpy as np
+
+SENTINEL = -99.99               # DS18B20 disconnected (firmware)
+KINDS = ("dropout", "stuck", "zscore", "step")
+KIND_TEXT = {"dropout": "dropout", "stuck": "stuck", "zscore": "outlier", "step": "sudden step"}
+HOLD_FRAMES = 10
+WARMUP_FRAMES = 50              # z-score stays quiet until the EWMA has settled
+
+
+class AnomalyDetector:
+    def __init__(self, channels: list, alpha: float = 0.02, z_limit: float = 6.0):
+        """channels: [{"name", "label", "lo", "hi", "step", "stuck", "std_floor"}, …]."""
+        self.names = [c["name"] for c in channels]
+        self.labels = [c["label"] for c in channels]
+        col = lambda k: np.array([c[k] for c in channels], dtype=float)
+        self.lo, self.hi = col("lo"), col("hi")
+        self.step_limit, self.stuck_frames = col("step"), col("stuck")
+        self.std_floor = col("std_floor")
+        self.alpha, self.z_limit = alpha, z_limit
+        n = len(channels)
+        self.mean = np.full(n, np.nan)
+        self.var = np.zeros(n)
+        self.prev = np.full(n, np.nan)
+        self.same = np.zeros(n)                  # consecutive unchanged frames
+        self.seen = np.zeros(n)                  # valid frames so far
+        self.hold = np.zeros((len(KINDS), n))
+        self.active = np.zeros((len(KINDS), n), dtype=bool)
+
+    def clean(self, x, channels=slice(None)) -> np.ndarray:
+        """Copy of x (…, channels) with dropouts (sentinel / out of range) replaced by NaN."""
+        x = np.array(x, dtype=float)
+        lo, hi = self.lo[channels], self.hi[channels]
+        with np.errstate(invalid="ignore"):
+            x[(np.abs(x - SENTINEL) < 0.005) | (x < lo) | (x > hi)] = np.nan
+        return x
+
+    def update(self, raw, moving=False) -> list:
+        """moving: bool or per-channel mask – channels expected to change this frame."""
+        x = self.clean(raw)
+        ok = np.isfinite(x)
+        has_prev = ok & np.isfinite(self.prev)
+
+        d = np.where(has_prev, np.abs(x - self.prev), 0.0)
+        # only frames where the channel should have moved count towards "stuck"
+        self.same = np.where(has_prev & (d == 0), self.same + np.asarray(moving, dtype=bool), 0)
+        step = has_prev & (d > self.step_limit)
+
+        std = np.maximum(np.sqrt(self.var), self.std_floor)
+        z = np.where(ok & np.isfinite(self.mean), np.abs(x - self.mean) / std, 0.0)
+        zs = (z > self.z_limit) & (self.seen >= WARMUP_FRAMES)
+
+        # EWMA update; an outlier is clipped so it can't drag the statistics along
+        first = ok & ~np.isfinite(self.mean)
+        self.mean[first] = x[first]
+        upd = ok & ~first
+        xc = np.clip(x, self.mean - self.z_limit * std, self.mean + self.z_limit * std)
+        delta = np.where(upd, xc - self.mean, 0.0)
+        self.mean += self.alpha * delta
+        self.var = np.where(upd, (1 - self.alpha) * (self.var + self.alpha * delta * delta), self.var)
+        self.seen += ok
+        self.prev = np.where(ok, x, self.prev)
+
+        self.hold = np.maximum(self.hold - 1, 0)
+        self.hold[2][zs] = HOLD_FRAMES
+        self.hold[3][step] = HOLD_FRAMES
+        stuck = (self.stuck_frames > 0) & (self.same >= self.stuck_frames)
+        now = np.vstack([~ok, stuck, self.hold[2] > 0, self.hold[3] > 0])
+
+        events = []
+        for k, ch in zip(*np.nonzero(now != self.active)):
+            events.append((f"{KINDS[k]}_{self.names[ch]}", f"{self.labels[ch]} {KIND_TEXT[KINDS[k]]}", bool(now[k, ch])))
+        self.active = now
+        return events
+
+    def dropout(self, name: str) -> bool:
+        return bool(self.active[0, self.names.index(name)])
+
+    def any_dropout(self) -> bool:
+        return bool(self.active[0].any())
+
+    def any_active(self) -> bool:
+        return bool(self.active.any())
+
+
+def bms_channels(n_cells: int = 6) -> list:
+    """Cells (V) then battery / heater temperature (°C)."""
+    cells = [{"name": f"cell{i + 1}", "label": f"Cell {i + 1}", "lo": 0.5, "hi": 5.0,
+              "step": 0.3, "stuck": 300, "std_floor": 0.005} for i in range(n_cells)]
+    temps = [{"name": n, "label": l, "lo": -55.0, "hi": 125.0,
+              "step": 5.0, "stuck": 3000, "std_floor": 0.25}
+             for n, l in (("t_batt", "Battery sensor"), ("t_heat", "Heater sensor"))]
+    return cells + temps
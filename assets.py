@@ -0,0 +1,77 @@
+"""
+Shared image asset cache
+──────────────────────────────────────────────────────────────
+• Each PNG is decoded at most once per process
+• Resized PhotoImages are cached by (name, size)
+• Optional on-disk cache of pre-resized PNGs, keyed by the
+  source file's mtime, so later cold starts skip the resize
+──────────────────────────────────────────────────────────────
+"""
+
+import os
+from PIL import Image, ImageTk
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIR = os.path.join(HERE, "iconsAndImages")
+CACHE_DIR = os.path.join(HERE, ".asset_cache")
+
+
+class AssetManager:
+    def __init__(self, asset_dir: str = ASSET_DIR, disk_cache: str = None):
+        self.asset_dir = asset_dir
+        self.disk_cache = disk_cache
+        self._decoded = {}     # name → PIL image
+        self._sizes = {}       # name → (w, h)
+        self._photos = {}      # (name, (w, h)) → PhotoImage
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.asset_dir, name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self.path(name))
+
+    def size(self, name: str, scale: float = 1.0):
+        """Scaled (w, h) of an asset; only reads the PNG header."""
+        if name not in self._sizes:
+            with Image.open(self.path(name)) as img:
+                self._sizes[name] = img.size
+        w, h = self._sizes[name]
+        return int(w * scale), int(h * scale)
+
+    def _decode(self, name: str):
+        img = self._decoded.get(name)
+        if img is None:
+            img = self._decoded[name] = Image.open(self.path(name))
+            img.load()
+            self._sizes[name] = img.size
+        return img
+
+    def _resized(self, name: str, size):
+        if size == self.size(name):
+            return self._decode(name)
+        cached = None
+        if self.disk_cache:
+            stem = os.path.splitext(name)[0].replace(" ", "_")
+            mtime = os.stat(self.path(name)).st_mtime_ns
+            cached = os.path.join(self.disk_cache, f"{stem}@{size[0]}x{size[1]}-{mtime}.png")
+            if os.path.exists(cached):
+                return Image.open(cached)
+        img = self._decode(name).resize(size)
+        if cached:
+            try:
+                os.makedirs(self.disk_cache, exist_ok=True)
+                img.save(cached)
+            except OSError:
+                pass                          # read-only install: memory cache only
+        return img
+
+    def image(self, name: str, scale: float = 1.0, size=None):
+        """PhotoImage for `name` at `scale` (or explicit `size`); None if missing."""
+        if not self.exists(name):
+            return None
+        size = tuple(size) if size else self.size(name, scale)
+        key = (name, size)
+        photo = self._photos.get(key)
+        if photo is None:
+            photo = self._photos[key] = ImageTk.PhotoImage(self._resized(name, size))
+        return photo
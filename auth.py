@@ -0,0 +1,71 @@
+"""
+Password hashing off the UI thread
+──────────────────────────────────────────────────────────────
+• PBKDF2-SHA256 runs on a small worker pool (hashlib drops the
+  GIL while deriving), callers get a Future to poll from Tk
+• VerifiedSessions: short-lived in-memory tokens for
+  credentials that already passed the KDF, so logging in again
+  within the TTL costs one HMAC instead of 100 000 iterations
+──────────────────────────────────────────────────────────────
+"""
+
+import os, hmac, hashlib, binascii, secrets, time, threading
+from concurrent.futures import ThreadPoolExecutor
+
+KDF_ITERATIONS = 100000
+SESSION_TTL_S  = 300
+
+_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="auth")
+
+
+def hash_password(password, salt=None):
+    if salt is None:
+        salt = os.urandom(16)
+    hashed = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, KDF_ITERATIONS)
+    return binascii.hexlify(salt).decode('ascii'), binascii.hexlify(hashed).decode('ascii')
+
+def verify_password(stored_salt, stored_hash, provided_password):
+    salt = binascii.unhexlify(stored_salt.encode('ascii'))
+    hashed = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, KDF_ITERATIONS)
+    return hmac.compare_digest(stored_hash, binascii.hexlify(hashed).decode('ascii'))
+
+def hash_password_async(password):
+    return _pool.submit(hash_password, password)
+
+def verify_password_async(stored_salt, stored_hash, provided_password):
+    return _pool.submit(verify_password, stored_salt, stored_hash, provided_password)
+
+
+class VerifiedSessions:
+    """Remembers recently verified credentials for `ttl` seconds (memory only)."""
+
+    def __init__(self, ttl: float = SESSION_TTL_S):
+        self.ttl = ttl
+        self._key = secrets.token_bytes(32)        # never leaves this process
+        self._tokens = {}                          # username → (token, expiry)
+        self._lock = threading.Lock()
+
+    def _token(self, username, stored_hash, password):
+        # bound to the stored hash, so a changed password invalidates it
+        msg = "\0".join((username, stored_hash, password)).encode("utf-8")
+        return hmac.new(self._key, msg, hashlib.sha256).digest()
+
+    def issue(self, username, stored_hash, password):
+        with self._lock:
+            self._tokens[username] = (self._token(username, stored_hash, password),
+                                      time.monotonic() + self.ttl)
+
+    def check(self, username, stored_hash, password) -> bool:
+        with self._lock:
+            entry = self._tokens.get(username)
+            if entry is None:
+                return False
+            if time.monotonic() > entry[1]:
+                del self._tokens[username]
+                return False
+        return hmac.compare_digest(entry[0], self._token(username, stored_hash, password))
+
+    def revoke(self, username=None):
+        with self._lock:
+            if username is None: self._tokens.clear()
+            else: self._tokens.pop(username, None)
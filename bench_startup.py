@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Import-time report for the dashboard's cold start
+──────────────────────────────────────────────────────────────
+Runs `python -X importtime -c "import Main"` in a fresh
+interpreter and lists the slowest imports by cumulative time.
+
+    python bench_startup.py                  # top 15 imports
+    python bench_startup.py --budget-ms 400  # exit 1 if over budget
+    python bench_startup.py --module gui     # report gui.py instead
+──────────────────────────────────────────────────────────────
+"""
+
+import argparse, os, subprocess, sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_times(module: str):
+    """[(self_us, cumulative_us, depth, name), …] for one cold import of `module`."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=HERE, capture_output=True, text=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((int(self_us), int(cum_us), depth, name.strip()))
+    if proc.returncode != 0:
+        sys.exit(f"import {module} failed:\n{proc.stderr.splitlines()[-1] if proc.stderr else ''}")
+    return rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--module", default="Main")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--budget-ms", type=float, default=None)
+    args = ap.parse_args()
+
+    rows = import_times(args.module)
+    total_ms = next(cum for _, cum, _, name in reversed(rows) if name == args.module) / 1000
+    print(f"import {args.module}: {total_ms:.1f} ms cumulative\n")
+    print(f"{'cumul ms':>9} {'self ms':>8}  module")
+    for self_us, cum_us, _, name in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f"{cum_us / 1000:9.1f} {self_us / 1000:8.1f}  {name}")
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nOVER BUDGET: {total_ms:.1f} ms > {args.budget_ms:.1f} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
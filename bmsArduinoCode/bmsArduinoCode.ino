@@ -6,7 +6,10 @@
 *  Host command :  S,<id>,<0|1>\n
 *                  id = 1–4 → relay index
 *  MCU reply    :  ACK,<pin>,<0|1>\n
-*  Telemetry    :  DATA,t1,t2,v1..v6\n
+*  Telemetry    :  DATA,seq,ms,t1,t2,v1..v6\n
+*                  seq = frame counter, ms = millis() at sampling
+*                  taps are the mean of every ADC pass since the
+*                  previous frame (OVERSAMPLE 1, 3 decimals)
 *****************************************************************/
 #include <OneWire.h>
 #include <DallasTemperature.h>
@@ -23,6 +26,12 @@ constexpr float    ADC_STEP  = 5.0f / 1023.0f;
 constexpr float    DIV_RATIO = 5.0f;
 constexpr uint32_t PUSH_MS   = 100;
 constexpr uint16_t DS_DELAY  = 94;
+constexpr uint8_t  NUM_TAPS  = 6;
+constexpr uint16_t OS_MAX    = 4096;   // passes per frame (1023 × 4096 fits uint32)
+constexpr uint8_t  FRAME_BUF = 112;
+ 
+/* ───── acquisition mode ────────────────────────────────────── */
+#define OVERSAMPLE 1   // 1: average all ADC passes between pushes, 0: one read per push
  
 /* ───── OneWire sensors ────────────────────────────────────── */
 OneWire bus1(TEMP1_PIN);
@@ -30,11 +39,46 @@ OneWire bus2(TEMP2_PIN);
 DallasTemperature ts1(&bus1);
 DallasTemperature ts2(&bus2);
  
+// Conversions run back to back: a reading is collected and the next
+// conversion requested in the same step; bus 2 starts half a period
+// later so the two buses never do their OneWire traffic in one pass.
+struct TempSensor {
+  DallasTemperature *ts;
+  DeviceAddress addr;
+  bool found;
+  bool busy;
+  uint32_t tStart;     // conversion start (or first start, while !busy)
+  float value;
+};
+TempSensor sensors[2] = {{&ts1, {0}, false, false, 0, NAN},
+                         {&ts2, {0}, false, false, DS_DELAY / 2, NAN}};
+ 
 /* ───── helper ─────────────────────────────────────────────── */
 inline void relayWrite(uint8_t pin, bool on) {
   digitalWrite(pin, on ? LOW : HIGH);
 }
  
+inline char *putFloat(char *p, float v, uint8_t prec) {
+  dtostrf(v, 1, prec, p);      // AVR printf has no %f
+  return p + strlen(p);
+}
+ 
+void serviceTemp(TempSensor &s, uint32_t now) {
+  if (!s.busy) {
+    if ((int32_t)(now - s.tStart) < 0) return;        // staggered first start
+    s.ts->requestTemperatures();
+    s.busy = true; s.tStart = now;
+    return;
+  }
+  if (now - s.tStart < DS_DELAY) return;
+  if (!s.found) s.found = s.ts->getAddress(s.addr, 0);  // cached: no bus search per read
+  float t = s.found ? s.ts->getTempC(s.addr) : DEVICE_DISCONNECTED_C;
+  if (t == DEVICE_DISCONNECTED_C) s.found = false;
+  s.value = (t == DEVICE_DISCONNECTED_C) ? NAN : t;
+  s.ts->requestTemperatures();                           // next conversion starts now
+  s.tStart = now;
+}
+ 
 /* ───── setup ──────────────────────────────────────────────── */
 void setup() {
   Serial.begin(115200);
@@ -50,6 +94,7 @@ void setup() {
   ts2.setResolution(9);
   ts1.setWaitForConversion(false);
   ts2.setWaitForConversion(false);
+  for (TempSensor &s : sensors) s.found = s.ts->getAddress(s.addr, 0);
  
   pinMode(TEMP1_PIN, INPUT_PULLUP);  // A0
   pinMode(TEMP2_PIN, INPUT_PULLUP);  // A1
@@ -75,43 +120,44 @@ void loop() {
     }
   }
  
-  // 2 ─ Read DS18B20 non-blocking
-  static bool convBusy = false;
-  static uint32_t tStart = 0;
-  static float t1 = NAN, t2 = NAN;
   uint32_t now = millis();
  
-  if (!convBusy) {
-    ts1.requestTemperatures();
-    ts2.requestTemperatures();
-    convBusy = true;
-    tStart = now;
-  } else if (now - tStart >= DS_DELAY) {
-    float temp1 = ts1.getTempCByIndex(0);
-    float temp2 = ts2.getTempCByIndex(0);
- 
-    t1 = (temp1 == DEVICE_DISCONNECTED_C) ? NAN : temp1;
-    t2 = (temp2 == DEVICE_DISCONNECTED_C) ? NAN : temp2;
-    convBusy = false;
+  // 2 ─ Temperatures: one OneWire transaction per pass, buses alternate
+  static uint8_t turn = 0;
+  serviceTemp(sensors[turn], now);
+  turn ^= 1;
+ 
+  // 3 ─ Oversample the taps between pushes
+  static uint32_t acc[NUM_TAPS] = {0};
+  static uint16_t nAcc = 0;
+#if OVERSAMPLE
+  if (nAcc < OS_MAX) {
+    for (uint8_t i = 0; i < NUM_TAPS; ++i) acc[i] += analogRead(VOLT_PINS[i]);
+    ++nAcc;
   }
+#endif
  
-  // 3 ─ Send telemetry every 100 ms
+  // 4 ─ Send telemetry every PUSH_MS, formatted into one buffer
   static uint32_t lastPush = 0;
+  static uint32_t seq = 0;
   if (now - lastPush >= PUSH_MS) {
     lastPush = now;
  
-    float v[6];
-    for (uint8_t i = 0; i < 6; ++i)
-      v[i] = analogRead(VOLT_PINS[i]) * ADC_STEP * DIV_RATIO;
- 
-    Serial.print(F("DATA,"));
-    Serial.print(isnan(t1) ? -99.99 : t1, 2); Serial.print(',');
-    Serial.print(isnan(t2) ? -99.99 : t2, 2); Serial.print(',');
-    for (uint8_t i = 0; i < 6; ++i) {
-      Serial.print(v[i], 2);
-      Serial.print(i < 5 ? ',' : '\n');
+#if !OVERSAMPLE
+    for (uint8_t i = 0; i < NUM_TAPS; ++i) acc[i] = analogRead(VOLT_PINS[i]);
+    nAcc = 1;
+#endif
+    char line[FRAME_BUF];
+    char *p = line + sprintf(line, "DATA,%lu,%lu,", (unsigned long)seq++, (unsigned long)now);
+    p = putFloat(p, isnan(sensors[0].value) ? -99.99f : sensors[0].value, 2); *p++ = ',';
+    p = putFloat(p, isnan(sensors[1].value) ? -99.99f : sensors[1].value, 2); *p++ = ',';
+    const float scale = ADC_STEP * DIV_RATIO / nAcc;
+    for (uint8_t i = 0; i < NUM_TAPS; ++i) {
+      p = putFloat(p, acc[i] * scale, OVERSAMPLE ? 3 : 2);
+      *p++ = (i < NUM_TAPS - 1) ? ',' : '\n';
+      acc[i] = 0;
     }
+    nAcc = 0;
+    Serial.write(line, p - line);
   }
 }
- 
- 
\ No newline at end of file
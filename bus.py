@@ -0,0 +1,90 @@
+"""
+In-process publish / subscribe data bus
+──────────────────────────────────────────────────────────────
+• Typed topics: FRAMES, RELAY, ALARMS, SESSION
+• Payloads are immutable, so every subscriber gets the very
+  same object (zero-copy fan-out, nothing re-parsed)
+• Per-subscriber rate limit: a throttled subscriber keeps only
+  the newest payload and gets it once its interval has passed
+  (on the next publish or flush())
+• Single-threaded by design – publish from the Tk thread only
+──────────────────────────────────────────────────────────────
+"""
+
+import time, traceback
+from collections import namedtuple
+
+from frame import Frame
+
+RelayEvent   = namedtuple("RelayEvent", "pin name on")
+AlarmEvent   = namedtuple("AlarmEvent", "name label active")
+SessionEvent = namedtuple("SessionEvent", "kind path")       # kind: "start" / "end"
+
+
+class Topic:
+    __slots__ = ("name", "type")
+
+    def __init__(self, name: str, payload_type: type):
+        self.name, self.type = name, payload_type
+
+    def __repr__(self):
+        return f"Topic({self.name})"
+
+
+FRAMES  = Topic("frames", Frame)
+RELAY   = Topic("relay", RelayEvent)
+ALARMS  = Topic("alarms", AlarmEvent)
+SESSION = Topic("session", SessionEvent)
+
+_NOTHING = object()
+
+
+class Subscription:
+    __slots__ = ("topic", "fn", "interval", "last", "pending")
+
+    def __init__(self, topic, fn, max_hz):
+        self.topic, self.fn = topic, fn
+        self.interval = 1.0 / max_hz if max_hz else 0.0
+        self.last, self.pending = float("-inf"), _NOTHING
+
+    def offer(self, payload, now):
+        if now - self.last < self.interval:
+            self.pending = payload
+            return
+        self.pending, self.last = _NOTHING, now
+        try:
+            self.fn(payload)
+        except Exception:
+            traceback.print_exc()
+
+
+class Bus:
+    def __init__(self):
+        self._subs = {}
+        self.published = {}          # topic name → count, for diagnostics
+
+    def subscribe(self, topic: Topic, fn, max_hz: float = None) -> Subscription:
+        sub = Subscription(topic, fn, max_hz)
+        self._subs.setdefault(topic, []).append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        subs = self._subs.get(sub.topic, [])
+        if sub in subs:
+            subs.remove(sub)
+
+    def publish(self, topic: Topic, payload):
+        if not isinstance(payload, topic.type):
+            raise TypeError(f"{topic.name} expects {topic.type.__name__}, got {type(payload).__name__}")
+        self.published[topic.name] = self.published.get(topic.name, 0) + 1
+        now = time.monotonic()
+        for sub in tuple(self._subs.get(topic, ())):
+            sub.offer(payload, now)
+
+    def flush(self):
+        """Deliver payloads held back by rate limits whose interval has passed."""
+        now = time.monotonic()
+        for subs in self._subs.values():
+            for sub in tuple(subs):
+                if sub.pending is not _NOTHING and now - sub.last >= sub.interval:
+                    sub.offer(sub.pending, now)
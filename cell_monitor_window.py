@@ -1,25 +1,22 @@
-
-
-import tkinter as tk, queue, time
+import tkinter as tk
+from visibility import RenderGate
+from bus import FRAMES
+from scheduler import FrameScheduler, NORMAL
 
 MAX_V = 4.20
 NUM   = 6
 
-_q = queue.Queue(maxsize=1)
+BG, FG, ACCENT = "#1e1e1e", "white", "#4fc3f7"
+FONT, FONT_B   = ("Consolas", 11), ("Consolas", 11, "bold")
+ROW_H, TOP     = 110, 10
+COL_X          = (90, 150, 240, 330, 420)          # Cell, V, %, Min, Max
 
-def push_cell_data(cumulative):
-    try:
-        while True: _q.get_nowait()
-    except queue.Empty:
-        pass
-    _q.put(cumulative)
+# one color per 20 % bucket, computed once
+_SOC_COLORS = ("#d00000", "#d07000", "#c0c000", "#70d000", "#00d000")
 
 def soc_color(pct: float) -> str:
-    if pct >= 80: return "#00d000"
-    if pct >= 60: return "#70d000"
-    if pct >= 40: return "#c0c000"
-    if pct >= 20: return "#d07000"
-    return "#d00000"
+    if pct != pct: return "#555"                   # NaN: cell not measured
+    return _SOC_COLORS[max(0, min(int(pct) // 20, 4))]
 
 class BatteryIcon:
     def __init__(self, canvas: tk.Canvas, x: int, y: int, w: int = 40, h: int = 100):
@@ -27,76 +24,89 @@ class BatteryIcon:
         self.cv.create_rectangle(x, y, x+w, y+h, width=2, outline="#aaa")
         self.cv.create_rectangle(x + w*0.3, y-8, x + w*0.7, y, fill="#555", outline="")
         self.fill = self.cv.create_rectangle(x+3, y+h-3, x+w-3, y+h-3, width=0, fill="#00d000")
+        self.shown = (None, None)                  # (fill height px, color)
 
     def update(self, pct: float):
-        pct = max(0, min(pct, 100))
-        h_fill = (self.h-6) * pct/100
-        self.cv.coords(self.fill, self.x+3, self.y + self.h-3 - h_fill,
-                       self.x+self.w-3, self.y+self.h-3)
-        self.cv.itemconfig(self.fill, fill=soc_color(pct))
+        color = soc_color(pct)
+        pct = max(0, min(pct, 100)) if pct == pct else 0
+        state = (round((self.h-6) * pct/100), color)
+        if state == self.shown:
+            return
+        h_fill, color = state
+        if h_fill != self.shown[0]:
+            self.cv.coords(self.fill, self.x+3, self.y + self.h-3 - h_fill,
+                           self.x+self.w-3, self.y+self.h-3)
+        if color != self.shown[1]:
+            self.cv.itemconfig(self.fill, fill=color)
+        self.shown = state
 
 class CellMonitor(tk.Toplevel):
-    def __init__(self):
+    """Icons and table share one canvas; only text items whose rounded value changed are touched."""
+
+    def __init__(self, bus):
         super().__init__()
         self.title("6-Cell Battery Monitor")
         self.geometry("700x720")
-        self.configure(bg="#1e1e1e")
-
-        wrapper = tk.Frame(self, bg="#1e1e1e")
-        wrapper.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.configure(bg=BG)
 
-        self.canvas = tk.Canvas(wrapper, width=100, height=NUM*110, bg="#1e1e1e", highlightthickness=0)
-        self.canvas.grid(row=0, column=0, rowspan=NUM+1, sticky="nsw", padx=(0, 20))
+        self.canvas = tk.Canvas(self, bg=BG, highlightthickness=0)
+        self.canvas.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        cv = self.canvas
 
-        info_hdr = ["Cell", "V", "%", "Min", "Max"]
-        for c, text in enumerate(info_hdr):
-            lbl = tk.Label(wrapper, text=text, fg="white", bg="#1e1e1e",
-                           font=("Consolas", 11, "bold"))
-            lbl.grid(row=0, column=c+1, sticky="w", padx=6)
+        for x, text in zip(COL_X, ("Cell", "V", "%", "Min", "Max")):
+            cv.create_text(x, TOP, text=text, anchor="nw", fill=FG, font=FONT_B)
 
-        self.icons = []
-        self.stats = []
+        self.icons, self.items, self.shown = [], [], []
         self.mins = [10.0] * NUM
         self.maxs = [0.0] * NUM
 
         for i in range(NUM):
-            y = i * 110 + 10
-            self.icons.append(BatteryIcon(self.canvas, 10, y, 40, 100))
-
-            lbl = tk.Label(wrapper, text=f"{i+1}", font=("Consolas", 11), fg="#4fc3f7", bg="#1e1e1e")
-            val = tk.Label(wrapper, font=("Consolas", 11), fg="white", bg="#1e1e1e")
-            pct = tk.Label(wrapper, font=("Consolas", 11), fg="white", bg="#1e1e1e")
-            mn  = tk.Label(wrapper, font=("Consolas", 11), fg="white", bg="#1e1e1e")
-            mx  = tk.Label(wrapper, font=("Consolas", 11), fg="white", bg="#1e1e1e")
-            for j, w in enumerate((lbl, val, pct, mn, mx), start=1):
-                w.grid(row=i+1, column=j, sticky="w", padx=6, pady=4)
-            self.stats.append((val, pct, mn, mx))
-
-        self.after(50, self._pump)
-
-    def _pump(self):
-        try:
-            cumulative = _q.get_nowait()
-            if len(cumulative) != 6:
-                return
-            sorted_cum = sorted(cumulative)
-            cells = [sorted_cum[0]] + [sorted_cum[i] - sorted_cum[i-1] for i in range(1, 6)]
-
-            for idx, v in enumerate(cells):
-                pct = (v / MAX_V) * 100
-                self.icons[idx].update(pct)
-
-                self.mins[idx] = min(self.mins[idx], v)
-                self.maxs[idx] = max(self.maxs[idx], v)
-
-                val, pct_l, mn, mx = self.stats[idx]
-                val.config(text=f"{v:.2f}")
-                pct_l.config(text=f"{pct:.1f}")
-                mn.config(text=f"{self.mins[idx]:.2f}")
-                mx.config(text=f"{self.maxs[idx]:.2f}")
-        except queue.Empty:
-            pass
-        self.after(50, self._pump)
-
-def run_monitor():
-    CellMonitor()
+            y = i * ROW_H + 18
+            self.icons.append(BatteryIcon(cv, 10, y, 40, 100))
+            cy = y + 50
+            cv.create_text(COL_X[0], cy, text=f"{i+1}", anchor="w", fill=ACCENT, font=FONT)
+            self.items.append(tuple(cv.create_text(x, cy, text="", anchor="w", fill=FG, font=FONT)
+                                    for x in COL_X[1:]))
+            self.shown.append(("", "", "", ""))
+
+        self.cells = [0.0] * NUM
+        self.dirty = False
+        self.render_gate = RenderGate(self, self._draw)
+        FrameScheduler.for_widget(self).every(50, self._refresh, NORMAL, owner=self)
+        # cells arrive already reconstructed by the dashboard; 20 Hz is plenty to draw
+        self.sub = bus.subscribe(FRAMES, self._on_frame, max_hz=20)
+        self.bind("<Destroy>", lambda e: e.widget is self and bus.unsubscribe(self.sub), add="+")
+
+    def _on_frame(self, frame):
+        # min/max keep tracking while minimized; widgets only update when shown
+        cells = frame.cells
+        if len(cells) != NUM:
+            return
+        for idx, v in enumerate(cells):
+            self.mins[idx] = min(self.mins[idx], v)
+            self.maxs[idx] = max(self.maxs[idx], v)
+        self.cells = cells
+        self.dirty = True           # drawn by the NORMAL job, not inside the publisher's job
+
+    def _refresh(self):
+        if self.dirty:
+            self.dirty = False
+            self.render_gate.request()
+
+    def _draw(self):
+        cv = self.canvas
+        for idx, v in enumerate(self.cells):
+            pct = (v / MAX_V) * 100
+            self.icons[idx].update(pct)
+
+            texts = (f"{v:.2f}", f"{pct:.1f}", f"{self.mins[idx]:.2f}", f"{self.maxs[idx]:.2f}")
+            old = self.shown[idx]
+            if texts == old:
+                continue
+            for item, new, was in zip(self.items[idx], texts, old):
+                if new != was:
+                    cv.itemconfigure(item, text=new)
+            self.shown[idx] = texts
+
+def run_monitor(bus):
+    CellMonitor(bus)
@@ -0,0 +1,41 @@
+"""
+Cell-voltage reconstruction from cumulative taps
+──────────────────────────────────────────────────────────────
+• Taps are read in their known wiring order (bottom → top),
+  never sorted, so noisy readings can't swap cells
+• Taps arrive already calibrated: the per-tap divider gain /
+  offset lives only in adc_calibration.json (signal_conditioning.py)
+• Implausible cells are rejected (NaN), never repaired: a tap
+  that reads NaN, or spoils both cells around it (an open
+  balance / sense lead reads ~0 V), is reported as a tap fault
+  and its cells stay NaN – made-up values would hide the fault
+  from the alarms and interlocks
+• Works on one frame (6,) or a batch of frames (n, 6)
+──────────────────────────────────────────────────────────────
+"""
+
+import numpy as np
+
+NUM_CELLS = 6
+TAP_ORDER  = (0, 1, 2, 3, 4, 5)        # DATA field index of each tap, bottom first
+CELL_V_MIN = 0.0
+CELL_V_MAX = 5.0
+
+
+def reconstruct_cells(taps, order=TAP_ORDER, v_min=CELL_V_MIN, v_max=CELL_V_MAX):
+    """
+    taps: calibrated cumulative tap voltages, shape (..., 6).
+    Returns (cells, pack_v, tap_fault); rejected cells are NaN,
+    tap_fault flags the taps whose reading can't be trusted.
+    """
+    t = np.asarray(taps, dtype=float)[..., list(order)]
+    cells = np.diff(t, axis=-1, prepend=0.0)
+    bad = ~((cells >= v_min) & (cells <= v_max))
+
+    # A faulty tap i corrupts cells i and i+1 in opposite directions
+    tap_fault = ~np.isfinite(t)
+    tap_fault[..., :-1] |= bad[..., :-1] & bad[..., 1:]
+
+    cells[bad] = np.nan
+    pack_v = np.where(bad[..., -1], np.nan, t[..., -1])
+    return cells, pack_v, tap_fault
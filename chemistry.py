@@ -0,0 +1,105 @@
+"""
+Chemistry profiles – OCV → SOC lookup
+──────────────────────────────────────────────────────────────
+• OCV tables (per temperature) are loaded once per profile
+• Each profile is resampled into a dense, evenly spaced grid
+  (1 mV × 1 °C), so a query is just an index calculation
+• soc_vector() evaluates a whole array of cells in one call
+• soc() is the scalar path, cached by quantized voltage
+──────────────────────────────────────────────────────────────
+"""
+
+import json, math, os
+from functools import lru_cache
+import numpy as np
+
+V_STEP = 0.001          # dense grid resolution (V)
+T_STEP = 1.0            # dense grid resolution (°C)
+DEFAULT_TEMP = 25.0
+
+# temp °C → [(OCV V, SOC %), …]  (ascending voltage)
+PROFILES = {
+    # Same mapping the GUI always used: 3.00 V → 0 %, 4.00 V → 100 %
+    "linear": {
+        25: [(3.00, 0.0), (4.00, 100.0)],
+    },
+    # Typical Li-ion NMC 18650 rest curve
+    "nmc": {
+        0:  [(3.00, 0.0), (3.35, 5.0), (3.50, 10.0), (3.60, 20.0), (3.66, 30.0), (3.71, 40.0),
+             (3.76, 50.0), (3.82, 60.0), (3.89, 70.0), (3.97, 80.0), (4.06, 90.0), (4.18, 100.0)],
+        25: [(3.00, 0.0), (3.30, 5.0), (3.45, 10.0), (3.55, 20.0), (3.62, 30.0), (3.68, 40.0),
+             (3.73, 50.0), (3.79, 60.0), (3.86, 70.0), (3.94, 80.0), (4.04, 90.0), (4.20, 100.0)],
+        45: [(3.00, 0.0), (3.28, 5.0), (3.43, 10.0), (3.54, 20.0), (3.61, 30.0), (3.67, 40.0),
+             (3.72, 50.0), (3.78, 60.0), (3.85, 70.0), (3.93, 80.0), (4.03, 90.0), (4.20, 100.0)],
+    },
+    # LiFePO4 – very flat plateau
+    "lfp": {
+        25: [(2.50, 0.0), (3.00, 5.0), (3.20, 10.0), (3.25, 20.0), (3.28, 40.0),
+             (3.30, 60.0), (3.32, 80.0), (3.35, 90.0), (3.45, 100.0)],
+    },
+}
+
+
+class ChemistryProfile:
+    def __init__(self, name: str, tables: dict):
+        self.name = name
+        items = sorted((float(t), sorted(pts)) for t, pts in tables.items())
+        temps = [t for t, _ in items]
+        rows = [pts for _, pts in items]
+
+        self.v0 = min(r[0][0] for r in rows)
+        v1 = max(r[-1][0] for r in rows)
+        self.t0, t1 = temps[0], temps[-1]
+        self.nv = int(round((v1 - self.v0) / V_STEP)) + 1
+        self.nt = int(round((t1 - self.t0) / T_STEP)) + 1
+
+        # 1) each table → dense voltage axis
+        v_grid = self.v0 + np.arange(self.nv) * V_STEP
+        coarse = np.array([np.interp(v_grid, [p[0] for p in r], [p[1] for p in r]) for r in rows])
+        # 2) blend between neighbouring tables → dense temperature axis
+        if len(temps) == 1:
+            self.lut = coarse
+        else:
+            t_grid = self.t0 + np.arange(self.nt) * T_STEP
+            ta = np.array(temps)
+            hi = np.clip(np.searchsorted(ta, t_grid, side="right"), 1, len(ta) - 1)
+            lo = hi - 1
+            w = ((t_grid - ta[lo]) / (ta[hi] - ta[lo]))[:, None]
+            self.lut = coarse[lo] * (1 - w) + coarse[hi] * w
+        self._flat = self.lut.ravel()
+        self._cache = {}
+
+    def _index(self, v, t):
+        iv = np.clip(np.rint((v - self.v0) / V_STEP), 0, self.nv - 1).astype(np.intp)
+        it = np.clip(np.rint((t - self.t0) / T_STEP), 0, self.nt - 1).astype(np.intp)
+        return it * self.nv + iv
+
+    def soc_vector(self, voltages, temps=DEFAULT_TEMP) -> np.ndarray:
+        """SOC % for an array of cell voltages (temps: scalar or same shape)."""
+        v = np.asarray(voltages, dtype=float)
+        bad = ~np.isfinite(v)
+        out = self._flat[self._index(np.where(bad, self.v0, v), np.nan_to_num(temps, nan=DEFAULT_TEMP))]
+        return np.where(bad, np.nan, out)
+
+    def soc(self, voltage: float, temp: float = DEFAULT_TEMP) -> float:
+        if not math.isfinite(voltage):             # dropout frame: same as soc_vector
+            return math.nan
+        if not math.isfinite(temp):
+            temp = DEFAULT_TEMP
+        key = (int(round(voltage / V_STEP)), int(round(temp / T_STEP)))
+        hit = self._cache.get(key)
+        if hit is None:
+            hit = self._cache[key] = float(self._flat[self._index(key[0] * V_STEP, key[1] * T_STEP)])
+        return hit
+
+
+@lru_cache(maxsize=None)
+def load_profile(name: str = "linear", path: str = None) -> ChemistryProfile:
+    """Build a profile once; `path` may point to a JSON file of extra tables."""
+    tables = dict(PROFILES)
+    if path and os.path.exists(path):
+        with open(path, "r") as f:
+            tables.update(json.load(f))
+    if name not in tables:
+        raise KeyError(f"Unknown chemistry profile: {name}")
+    return ChemistryProfile(name, tables[name])
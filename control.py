@@ -0,0 +1,145 @@
+"""
+Auto-Pilot control
+──────────────────────────────────────────────────────────────
+• BangBangController: heater / solenoid / pump follow the
+  battery set-point, conditions evaluated by the alarm engine
+      – heater on while the battery is below set-point and the
+        heater is not too far above it (and no interlock)
+      – solenoid + pump circulate once the heater leads the
+        battery, stop when the battery reaches set-point
+• PredictiveController: every DECIDE_S re-plans the heater with
+  the fitted thermal model (thermal_model.py), starting from an
+  observer estimate (model prediction pulled towards the 0.5 °C
+  sensor readings) rather than the raw readings – candidate plans
+  "heater on for the next k s, pump for the next j s, then off"
+  (every k × j pair) are rolled out together (vectorized) and
+  scored on set-point error (overshoot weighted higher) plus
+  heater energy. Only the first move is applied; relays hold
+  each state for MIN_DWELL_S. Plans are only as good as the
+  model: fit it from real sessions first (thermal_model.py)
+• step() returns the wanted relay states; the caller owns the
+  relays (GUI thread or acquisition worker)
+• make_controller("bangbang" | "mpc")
+──────────────────────────────────────────────────────────────
+"""
+
+import math, time
+import numpy as np
+
+from alarms import AlarmEngine
+from thermal_model import ThermalModel
+
+HEATER, SOLENOID, PUMP, LOAD = 1, 2, 3, 4
+
+# Auto-Pilot conditions, evaluated by the same engine as the alarms
+AUTOPILOT_RULES = [
+    {"name": "batt_cold",    "metric": "t_batt", "ref": "setpoint", "op": "<",  "limit": 0.0},
+    {"name": "heater_hot",   "metric": "t_heat", "ref": "setpoint", "op": ">",  "limit": 20.0},
+    {"name": "heater_ahead", "metric": "t_heat", "ref": "t_batt",   "op": ">=", "limit": 10.0},
+]
+
+
+class BangBangController:
+    def __init__(self, rules: list = AUTOPILOT_RULES):
+        self.engine = AlarmEngine({"t_batt": 1, "t_heat": 1, "setpoint": 1}, rules)
+
+    def step(self, t_batt: float, t_heat: float, setpoint: float, interlock: bool = False, now: float = None) -> dict:
+        """{pin: on} for the relays this step wants to set; other pins are left alone."""
+        ap = self.engine
+        ap.evaluate({"t_batt": t_batt, "t_heat": t_heat, "setpoint": setpoint})
+        cold = ap.is_active("batt_cold")
+        out = {HEATER: cold and not ap.is_active("heater_hot") and not interlock}
+        if cold and ap.is_active("heater_ahead"):
+            out[SOLENOID] = out[PUMP] = True
+        elif not cold:
+            out[SOLENOID] = out[PUMP] = False
+        return out
+
+
+# Predictive controller tuning
+DECIDE_S     = 1.0       # re-plan period
+HORIZON_S    = 240.0     # look-ahead
+PLAN_DT      = 2.0       # rollout step
+MIN_DWELL_S  = 10.0      # minimum time a relay holds a state (fewer cycles)
+HEATER_MAX_MARGIN = 20.0 # loop never planned above set-point + this (same limit as heater_hot)
+PUMP_LEAD    = 1.0       # °C the loop must lead the battery to be worth pumping
+W_OVERSHOOT  = 5000.0    # overshoot costs this much more than undershoot
+W_ENERGY     = 10.0      # cost per second of heater on-time
+OBS_TAU_S    = 5.0       # observer: how fast estimates follow the 0.5 °C-quantized sensors
+
+
+class PredictiveController:
+    def __init__(self, model: ThermalModel = None):
+        self.model = model or ThermalModel.load()
+        self.n = int(HORIZON_S / PLAN_DT)
+        lengths = np.arange(0, self.n + 1, 4)            # candidate on-durations (plan steps)
+        self.k, self.j = (a.ravel() for a in np.meshgrid(lengths, lengths))   # heater, pump
+        self.state = {HEATER: False, SOLENOID: False, PUMP: False}
+        self.changed = {pin: -math.inf for pin in self.state}
+        self.next_plan = -math.inf
+        self.want = (False, False)
+        self.est, self.est_t = None, None                # observer (t_heat, t_batt) estimate
+
+    def plan(self, t_batt: float, t_heat: float, setpoint: float) -> tuple:
+        """(heater, pump) first move of the cheapest plan."""
+        m = self.model
+        th = np.full(len(self.k), t_heat, dtype=float)
+        tb = np.full(len(self.k), t_batt, dtype=float)
+        cost = W_ENERGY * self.k * PLAN_DT
+        for i in range(self.n):
+            u = (i < self.k) & (th < setpoint + HEATER_MAX_MARGIN)
+            pump = (i < self.j) & (th > tb + PUMP_LEAD)
+            th, tb = m.step(th, tb, u, pump, PLAN_DT)
+            e = tb - setpoint
+            cost += PLAN_DT * e * e * np.where(e > 0, W_OVERSHOOT, 1.0)
+        best = np.argmin(cost)
+        return bool(self.k[best] > 0), bool(self.j[best] > 0)
+
+    def observe(self, t_batt: float, t_heat: float, now: float) -> tuple:
+        """Model prediction with the applied relays, pulled towards the (quantized) readings."""
+        if self.est is None:
+            self.est = (t_heat, t_batt)
+        else:
+            th, tb = self.model.step(*self.est, self.state[HEATER], self.state[PUMP], now - self.est_t)
+            g = min(1.0, (now - self.est_t) / OBS_TAU_S)
+            self.est = (th + g * (t_heat - th), tb + g * (t_batt - tb))
+        self.est_t = now
+        return self.est
+
+    def _set(self, out: dict, pin: int, on: bool, now: float):
+        on = bool(on)
+        if on != self.state[pin] and now - self.changed[pin] >= MIN_DWELL_S:
+            self.state[pin], self.changed[pin] = on, now
+        out[pin] = self.state[pin]
+
+    def step(self, t_batt: float, t_heat: float, setpoint: float, interlock: bool = False, now: float = None) -> dict:
+        now = time.monotonic() if now is None else now
+        out = {}
+        if interlock or not (math.isfinite(t_batt) and math.isfinite(t_heat)):
+            # safety first: no dwell time for switching the heater off
+            self.state[HEATER], self.changed[HEATER] = False, now
+            out[HEATER] = False
+        else:
+            est_heat, est_batt = self.observe(t_batt, t_heat, now)
+            if now >= self.next_plan:
+                self.want = self.plan(est_batt, est_heat, setpoint)
+                self.next_plan = now + DECIDE_S
+            heat = self.want[0] and t_heat < setpoint + HEATER_MAX_MARGIN
+            if not heat and self.state[HEATER] and t_heat >= setpoint + HEATER_MAX_MARGIN:
+                self.changed[HEATER] = -math.inf                 # over-temperature overrides dwell
+            self._set(out, HEATER, heat, now)
+        circulate = self.want[1] and math.isfinite(t_batt) and math.isfinite(t_heat) \
+            and t_heat > t_batt + PUMP_LEAD
+        self._set(out, SOLENOID, circulate, now)
+        self._set(out, PUMP, circulate, now)
+        return out
+
+
+CONTROLLERS = {"bangbang": BangBangController, "mpc": PredictiveController}
+
+
+def make_controller(name: str = "bangbang"):
+    try:
+        return CONTROLLERS[name]()
+    except KeyError:
+        raise ValueError(f"unknown controller {name!r} (choose from {', '.join(CONTROLLERS)})") from None
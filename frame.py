@@ -0,0 +1,104 @@
+"""
+Telemetry frame types
+──────────────────────────────────────────────────────────────
+• Frame      – one immutable sample, __slots__ only (no dict)
+• FRAME_DTYPE – the same fields as a NumPy structured dtype
+• FrameRing  – fixed-size history of frames as a record array;
+               view() is always a contiguous, time-ordered
+               slice, so plots take columns with no copying
+• RecordLog  – append-only growable record array (session log)
+──────────────────────────────────────────────────────────────
+"""
+
+import numpy as np
+
+NUM_CELLS = 6
+
+FRAME_DTYPE = np.dtype([("seq", "u4"), ("t", "f8"), ("t_batt", "f8"), ("t_heat", "f8"),
+                        ("cells", "f8", (NUM_CELLS,)), ("pack_v", "f8")])
+
+
+class Frame:
+    __slots__ = ("t", "t_batt", "t_heat", "cells", "pack_v", "seq")
+
+    def __init__(self, t, t_batt, t_heat, cells, pack_v, seq=0):
+        s = object.__setattr__
+        s(self, "t", t); s(self, "t_batt", t_batt); s(self, "t_heat", t_heat)
+        s(self, "cells", tuple(cells)); s(self, "pack_v", pack_v); s(self, "seq", seq)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Frame is immutable")
+
+    __delattr__ = __setattr__
+
+    def __repr__(self):
+        return (f"Frame(seq={self.seq}, t={self.t:.3f}, t_batt={self.t_batt}, "
+                f"t_heat={self.t_heat}, pack_v={self.pack_v})")
+
+    @classmethod
+    def from_record(cls, rec):
+        return cls(float(rec["t"]), float(rec["t_batt"]), float(rec["t_heat"]),
+                   rec["cells"].tolist(), float(rec["pack_v"]), int(rec["seq"]))
+
+    def to_record(self):
+        return (self.seq, self.t, self.t_batt, self.t_heat, self.cells, self.pack_v)
+
+
+class FrameRing:
+    """Last `capacity` records; each row is written twice so view() never wraps."""
+
+    def __init__(self, capacity: int, dtype=FRAME_DTYPE):
+        self.capacity = capacity
+        self._a = np.zeros(2 * capacity, dtype)
+        self._head = 0          # next write slot in [0, capacity)
+        self.count = 0
+
+    def extend(self, recs: np.ndarray):
+        for rec in recs[-self.capacity:]:
+            self._a[self._head] = rec
+            self._a[self._head + self.capacity] = rec
+            self._head = (self._head + 1) % self.capacity
+        self.count = min(self.count + len(recs), self.capacity)
+
+    def append(self, frame: Frame):
+        self.extend(np.array([frame.to_record()], self._a.dtype))
+
+    def view(self) -> np.ndarray:
+        start = self._head + self.capacity - self.count
+        return self._a[start:start + self.count]
+
+    def __len__(self):
+        return self.count
+
+
+class RecordLog:
+    """Append-only record array with amortized O(1) growth."""
+
+    def __init__(self, dtype, capacity: int = 1024):
+        self._a = np.zeros(capacity, dtype)
+        self.count = 0
+
+    def append(self, row: tuple):
+        if self.count == len(self._a):
+            self._a = np.resize(self._a, 2 * len(self._a))
+        self._a[self.count] = row
+        self.count += 1
+
+    def clear(self):
+        self.count = 0
+
+    def view(self) -> np.ndarray:
+        return self._a[:self.count]
+
+    def __len__(self):
+        return self.count
+
+
+def batch_records(seq0, t, t_batt, t_heat, cells, pack_v) -> np.ndarray:
+    """Build a FRAME_DTYPE record array for a batch straight from column arrays."""
+    n = len(t)
+    recs = np.empty(n, FRAME_DTYPE)
+    recs["seq"] = np.arange(seq0, seq0 + n)
+    recs["t"], recs["t_batt"], recs["t_heat"] = t, t_batt, t_heat
+    recs["cells"], recs["pack_v"] = cells, pack_v
+    return recs
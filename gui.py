@@ -1,11 +1,24 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
-import os, json, hashlib, binascii
+import os
 import random
 import time
 import logging
 import re
+from chemistry import load_profile
+from alarms import AlarmEngine
+from user_store import open_user_store
+from assets import AssetManager, CACHE_DIR
+from visibility import RenderGate
+from scheduler import FrameScheduler, HIGH, NORMAL, LOW
+from bus import Bus, ALARMS, AlarmEvent
+from auth import hash_password_async, verify_password_async, VerifiedSessions
+
+USER_STORE = open_user_store("users.json")   # use a .db path for the SQLite backend
+SESSIONS = VerifiedSessions()
+ASSETS = AssetManager(disk_cache=CACHE_DIR)   # each PNG decoded/resized once
+
+CHEMISTRY = "linear"     # see chemistry.PROFILES
 
 # Set up logging to file
 logging.basicConfig(
@@ -31,12 +44,17 @@ def is_valid_username(username):
 # --- Helper Function for SoC Calculation ---
 def voltage_to_soc(voltage):
     """
-    Calculate SoC based on a linear mapping:
-    3.00V  -> 0% SoC
-    4.00V  -> 100% SoC
+    Look up SoC from the active chemistry profile's OCV table
+    (default "linear": 3.00V -> 0% SoC, 4.00V -> 100% SoC).
     """
-    soc = (voltage - 3.00) / (4.00 - 3.00) * 100
-    return max(0, min(soc, 100))
+    return load_profile(CHEMISTRY).soc(voltage)
+
+def load_asset(filename, scale=1.0, size=None):
+    """Cached PhotoImage from iconsAndImages; shows an error if it is missing."""
+    img = ASSETS.image(filename, scale, size)
+    if img is None:
+        messagebox.showerror("Error", f"Image not found: {ASSETS.path(filename)}")
+    return img
 
 # --- Dummy Serial Class for Simulation ---
 class DummySerial:
@@ -51,18 +69,6 @@ class DummySerial:
         time.sleep(0.1)  # Simulate a small delay
         return (",".join(values) + "\n").encode('utf-8')
 
-# --- Password Hashing Utilities ---
-def hash_password(password, salt=None):
-    if salt is None:
-        salt = os.urandom(16)
-    hashed = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, 100000)
-    return binascii.hexlify(salt).decode('ascii'), binascii.hexlify(hashed).decode('ascii')
-
-def verify_password(stored_salt, stored_hash, provided_password):
-    salt = binascii.unhexlify(stored_salt.encode('ascii'))
-    hashed = hashlib.pbkdf2_hmac('sha256', provided_password.encode('utf-8'), salt, 100000)
-    return stored_hash == binascii.hexlify(hashed).decode('ascii')
-
 # --- RegistrationFrame ---
 class RegistrationFrame(tk.Frame):
     def __init__(self, master, switch_to_login):
@@ -79,8 +85,11 @@ class RegistrationFrame(tk.Frame):
         tk.Label(self, text="Password", bg="#063028", fg="white").pack()
         self.password_entry = tk.Entry(self, show="*")
         self.password_entry.pack()
-        tk.Button(self, text="Register", command=self.register_user).pack(pady=10)
+        self.register_btn = tk.Button(self, text="Register", command=self.register_user)
+        self.register_btn.pack(pady=10)
         tk.Button(self, text="Already have an account? Login", command=self.switch_to_login).pack(pady=5)
+        self.status_label = tk.Label(self, text="", bg="#063028", fg="#DEEBDD")
+        self.status_label.pack()
     
     def register_user(self):
         username = self.username_entry.get().strip()
@@ -88,17 +97,24 @@ class RegistrationFrame(tk.Frame):
         if not username or not password:
             messagebox.showerror("Error", "Please enter both username and password")
             return
-        users = {}
-        if os.path.exists("users.json"):
-            with open("users.json", "r") as f:
-                users = json.load(f)
-        if username in users:
+        if username in USER_STORE:
+            messagebox.showerror("Error", "Username already exists")
+            return
+        # Derive the hash on the auth worker; poll so the window stays responsive.
+        self.register_btn.config(state="disabled")
+        self.status_label.config(text="Creating account...")
+        self.after(50, self.finish_register, hash_password_async(password), username)
+
+    def finish_register(self, future, username):
+        if not future.done():
+            self.after(50, self.finish_register, future, username)
+            return
+        self.register_btn.config(state="normal")
+        self.status_label.config(text="")
+        salt, hashed = future.result()
+        if not USER_STORE.add(username, {"salt": salt, "hash": hashed}):
             messagebox.showerror("Error", "Username already exists")
             return
-        salt, hashed = hash_password(password)
-        users[username] = {"salt": salt, "hash": hashed}
-        with open("users.json", "w") as f:
-            json.dump(users, f)
         messagebox.showinfo("Success", "Registration successful!")
         self.switch_to_login()
         
@@ -122,8 +138,11 @@ class LoginFrame(tk.Frame):
         tk.Label(self, text="Password", bg="#063028", fg="white").pack()
         self.password_entry = tk.Entry(self, show="*")
         self.password_entry.pack()
-        tk.Button(self, text="Login", command=self.login).pack(pady=10)
+        self.login_btn = tk.Button(self, text="Login", command=self.login)
+        self.login_btn.pack(pady=10)
         tk.Button(self, text="Register", command=self.switch_to_register).pack(pady=5)
+        self.status_label = tk.Label(self, text="", bg="#063028", fg="#DEEBDD")
+        self.status_label.pack()
     
     def login(self):
         username = self.username_entry.get().strip()
@@ -131,18 +150,34 @@ class LoginFrame(tk.Frame):
         if not username or not password:
             messagebox.showerror("Error", "Please enter both username and password")
             return
-        if not os.path.exists("users.json"):
+        if not len(USER_STORE):
             messagebox.showerror("Error", "No registered users. Please register first.")
             return
-        with open("users.json", "r") as f:
-            users = json.load(f)
-        if username in users:
-            stored = users[username]
-            if verify_password(stored["salt"], stored["hash"], password):
-                messagebox.showinfo("Success", "Login successful!")
-                self.login_success(username)
-                return
-        messagebox.showerror("Error", "Invalid username or password")
+        stored = USER_STORE.get(username)
+        if not stored:
+            messagebox.showerror("Error", "Invalid username or password")
+            return
+        # Recently verified credentials skip the KDF entirely.
+        if SESSIONS.check(username, stored["hash"], password):
+            self.login_success(username)
+            return
+        self.login_btn.config(state="disabled")
+        self.status_label.config(text="Verifying...")
+        future = verify_password_async(stored["salt"], stored["hash"], password)
+        self.after(50, self.finish_login, future, username, stored["hash"], password)
+
+    def finish_login(self, future, username, stored_hash, password):
+        if not future.done():
+            self.after(50, self.finish_login, future, username, stored_hash, password)
+            return
+        self.login_btn.config(state="normal")
+        self.status_label.config(text="")
+        if future.result():
+            SESSIONS.issue(username, stored_hash, password)
+            messagebox.showinfo("Success", "Login successful!")
+            self.login_success(username)
+        else:
+            messagebox.showerror("Error", "Invalid username or password")
 
 # --- NavigationView ---
 class NavigationView(tk.Frame):
@@ -153,16 +188,7 @@ class NavigationView(tk.Frame):
         self.create_widgets()
     
     def load_battery6_image(self):
-        path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "battery(6).png")
-        if not os.path.exists(path):
-            messagebox.showerror("Error", f"Battery(6) image not found: {path}")
-            return
-        img = Image.open(path)
-        w, h = img.size
-        new_w = int(w * 0.5)
-        new_h = int(h * 0.5)
-        resized_img = img.resize((new_w, new_h))
-        self.battery6_image = ImageTk.PhotoImage(resized_img)
+        self.battery6_image = load_asset("battery(6).png", 0.5)
     
     def create_widgets(self):
         canvas = tk.Canvas(self, width=self.battery6_image.width(), height=self.battery6_image.height(),
@@ -209,6 +235,7 @@ class SystemView(tk.Frame):
         # Dictionary for overall panel text items.
         self.rect_text_items = {}
         self.alarm_manual_active = False  # Manual alarm override flag.
+        self.alarms = AlarmEngine({"cell_v": 12, "cell_temp": 12, "temp_avg": 1}, app="gui")
         self.load_all_images()
 
         # Create overall system panels.
@@ -283,68 +310,22 @@ class SystemView(tk.Frame):
         lbl_arrow.place(x=20, y=20)
         lbl_arrow.bind("<Button-1>", lambda event: self.go_back())
         
-        self.after(1000, self.update_sensor_values)
+        self.latest = None
+        self.render_gate = RenderGate(self, self.render_sensor_values)
+        FrameScheduler.for_widget(self).every(1000, self.update_sensor_values, HIGH, owner=self)
     
     def load_all_images(self):
-        # Load Rectangle 9.png and resize to 45% of original dimensions.
-        rect_img_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Rectangle 9.png")
-        if not os.path.exists(rect_img_path):
-            messagebox.showerror("Error", f"Rectangle 9 image not found: {rect_img_path}")
-            return
-        rect_img = Image.open(rect_img_path)
-        w, h = rect_img.size
-        new_w = int(w * 0.45)
-        new_h = int(h * 0.45)
-        resized_rect = rect_img.resize((new_w, new_h))
-        self.rect9_image = ImageTk.PhotoImage(resized_rect)
-        
-        # Load Rectangle 26.png for normal overall alarm panel.
-        rect26_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Rectangle 26.png")
-        if not os.path.exists(rect26_path):
-            messagebox.showerror("Error", f"Rectangle 26 image not found: {rect26_path}")
-            return
-        rect26_img = Image.open(rect26_path)
-        resized_rect26 = rect26_img.resize((new_w, new_h))
-        self.rect26_image = ImageTk.PhotoImage(resized_rect26)
-        
-        # Load Rectangle 27.png for active overall alarm panel (unused here).
-        rect27_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Rectangle 27.png")
-        if not os.path.exists(rect27_path):
-            messagebox.showerror("Error", f"Rectangle 27 image not found: {rect27_path}")
-            return
-        rect27_img = Image.open(rect27_path)
-        resized_rect27 = rect27_img.resize((new_w, new_h))
-        self.rect27_image = ImageTk.PhotoImage(resized_rect27)
-        
-        # Load battery (10).png for active alarm state for battery icons.
-        battery10_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "battery (10).png")
-        if not os.path.exists(battery10_path):
-            messagebox.showerror("Error", f"Battery (10) image not found: {battery10_path}")
-            return
-        battery10_img = Image.open(battery10_path)
-        # Adjust the size as desired; here we use the same new_w, new_h as the overall panels.
-        resized_battery10 = battery10_img.resize((int(new_w * 0.9), int(new_h * 0.9)))
-        self.battery10_image = ImageTk.PhotoImage(resized_battery10)
-        
-        # Load Image 5.png and resize to 35% of original dimensions.
-        image5_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Image 5.png")
-        if not os.path.exists(image5_path):
-            messagebox.showerror("Error", f"Image 5 not found: {image5_path}")
-            return
-        img5 = Image.open(image5_path)
-        w5, h5 = img5.size
-        new_w5 = int(w5 * 0.35)
-        new_h5 = int(h5 * 0.35)
-        resized_img5 = img5.resize((new_w5, new_h5))
-        self.image5 = ImageTk.PhotoImage(resized_img5)
-        
-        # Load Arrow 1.png without resizing.
-        arrow_img_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Arrow 1.png")
-        if not os.path.exists(arrow_img_path):
-            messagebox.showerror("Error", f"Arrow 1 image not found: {arrow_img_path}")
-            return
-        arrow_img = Image.open(arrow_img_path)
-        self.arrow_image = ImageTk.PhotoImage(arrow_img)
+        # Panels at 45% of Rectangle 9; the alarm variants reuse that size.
+        panel = ASSETS.size("Rectangle 9.png", 0.45) if ASSETS.exists("Rectangle 9.png") else None
+        self.rect9_image = load_asset("Rectangle 9.png", size=panel)
+        self.rect26_image = load_asset("Rectangle 26.png", size=panel)   # normal overall alarm panel
+        self.rect27_image = load_asset("Rectangle 27.png", size=panel)   # active overall alarm panel
+        # Active alarm state for battery icons, 90% of the panel size.
+        self.battery10_image = load_asset("battery (10).png",
+                                          size=(int(panel[0] * 0.9), int(panel[1] * 0.9)) if panel else None)
+        # Cell icon background at 35%.
+        self.image5 = load_asset("Image 5.png", 0.35)
+        self.arrow_image = self.master.arrow_image
         
         # Create dummy serial connection.
         try:
@@ -357,122 +338,112 @@ class SystemView(tk.Frame):
         self.alarm_manual_active = not self.alarm_manual_active
         print("Manual alarm override set to", self.alarm_manual_active)
         self.master.alarm_active = self.alarm_manual_active
+        self.master.bus.publish(ALARMS, AlarmEvent("manual", "Manual override activated",
+                                                   self.alarm_manual_active))
     
     def update_sensor_values(self):
+        # Acquisition, alarms and logging always run; drawing only while shown.
         if self.serial_obj:
             try:
                 line = self.serial_obj.readline().decode('utf-8').strip()
                 if line:
                     values = line.split(',')
                     if len(values) >= 12:
-                        # Build list of per-cell random temps and update icons
-                        battery_temps = []
-                        for i, canvas in enumerate(self.center_text_canvases):
-                            voltage = float(values[i])
-                            cell_soc = voltage_to_soc(voltage)
-                            temp_val = random.uniform(15, 18)
-                            battery_temps.append(temp_val)
-
-                        # Compute overall temperature for alarm logic
-                        overall_temp = sum(battery_temps) / len(battery_temps)
+                        # Per-cell SoC in one vectorized lookup, random temps for now
+                        voltages = [float(v) for v in values[:len(self.center_text_canvases)]]
+                        cell_socs = load_profile(CHEMISTRY).soc_vector(voltages)
+                        battery_temps = [random.uniform(15, 18) for _ in voltages]
 
-                        # Apply alarm or normal icon update
-                        if self.alarm_manual_active or overall_temp > 20:
-                            for i, canvas in enumerate(self.center_text_canvases):
-                                canvas.delete("bg")
-                                canvas.create_image(0, 0, image=self.battery10_image,
-                                                    anchor='nw', tags="bg")
-                                canvas.tag_lower("bg")
-                                canvas.itemconfig(self.center_text_items[i],
-                                                  text="Safety Shutdown Active",
-                                                  fill="#DEEBDD",
-                                                  font=("Helvetica", 9, "bold"))
-                                canvas.itemconfig(self.secondary_text_items[i],
-                                                  text="", fill="white")
-                        else:
-                            for i, canvas in enumerate(self.center_text_canvases):
-                                voltage = float(values[i])
-                                cell_soc = voltage_to_soc(voltage)
-                                canvas.delete("bg")
-                                canvas.create_image(0, 0, image=self.image5,
-                                                    anchor='nw', tags="bg")
-                                canvas.tag_lower("bg")
-                                canvas.itemconfig(self.center_text_items[i],
-                                                  text=f"Voltage: {voltage:.2f}V",
-                                                  fill="#DEEBDD")
-                                canvas.itemconfig(self.secondary_text_items[i],
-                                                  text=f"SoC: {cell_soc:.0f}%",
-                                                  fill="#DEEBDD")
-                                if self.shutdown_text_items[i] is not None:
-                                    canvas.delete(self.shutdown_text_items[i])
-                                    self.shutdown_text_items[i] = None
+                        # Compute overall temperature and run the alarm rules
+                        overall_temp = sum(battery_temps) / len(battery_temps)
+                        events = self.alarms.evaluate({"cell_v": voltages, "cell_temp": battery_temps,
+                                                       "temp_avg": overall_temp})
+                        alarm_reasons = self.alarms.active_labels()
+                        self.master.alarm_reasons = alarm_reasons
+                        self.master.alarm_active = self.alarm_manual_active or bool(alarm_reasons)
 
                         # --- NEW: compute average voltage of all 12 cells ---
                         battery_values   = [float(v) for v in values]
                         average_voltage  = sum(battery_values) / len(battery_values)
                         overall_soc      = voltage_to_soc(average_voltage)
-                        overall_soh      = random.uniform(90, 100)
-
-                        # Update overall panels
-                        canvas, text_id = self.rect_text_items["SoC:"]
-                        canvas.itemconfig(text_id, text=f"{overall_soc:.0f}%")
-                        canvas, text_id = self.rect_text_items["Voltage:"]
-                        canvas.itemconfig(text_id, text=f"{average_voltage:.2f}V")
-                        canvas, text_id = self.rect_text_items["Temp:"]
-                        canvas.itemconfig(text_id, text=f"{overall_temp:.0f}°C")
-
-                        # Update Alarm Status panel
-                        alarm_canvas, _ = self.rect_text_items["Alarm Status:"]
-                        alarm_canvas.delete("all")
+
                         if self.alarm_manual_active:
                             logging.info("Alarm Active: Manual override.")
-                            alarm_canvas.create_image(0, 0, image=self.rect27_image, anchor='nw')
-                            alarm_canvas.create_text(self.rect27_image.width()/2, 5,
-                                                     text="Alarm Status:",
-                                                     fill="white",
-                                                     font=("Helvetica", 14, "bold"),
-                                                     anchor="n")
-                            alarm_canvas.create_text(self.rect27_image.width()/2,
-                                                     self.rect27_image.height()/2,
-                                                     text="Active",
-                                                     fill="white",
-                                                     font=("Helvetica", 20, "bold"),
-                                                     anchor="center")
-                            
-                        elif overall_temp > 20:
-                            logging.info("Alarm Active: Temperature exceeded threshold or manual override.")
-                            alarm_canvas.create_image(0, 0, image=self.rect27_image, anchor='nw')
-                            alarm_canvas.create_text(self.rect27_image.width()/2, 5,
-                                                     text="Alarm Status:",
-                                                     fill="white",
-                                                     font=("Helvetica", 14, "bold"),
-                                                     anchor="n")
-                            alarm_canvas.create_text(self.rect27_image.width()/2,
-                                                     self.rect27_image.height()/2,
-                                                     text="Active",
-                                                     fill="white",
-                                                     font=("Helvetica", 20, "bold"),
-                                                     anchor="center")    
+                        elif alarm_reasons:
+                            logging.info("Alarm Active: " + ", ".join(alarm_reasons))
                         else:
                             logging.info("Alarm Clear: Temperature is normal.")
-                            alarm_canvas.create_image(0, 0, image=self.rect26_image, anchor='nw')
-                            alarm_canvas.create_text(self.rect26_image.width()/2, 5,
-                                                     text="Alarm Status:",
-                                                     fill="white",
-                                                     font=("Helvetica", 14, "bold"),
-                                                     anchor="n")
-                            alarm_canvas.create_text(self.rect26_image.width()/2,
-                                                     self.rect26_image.height()/2,
-                                                     text="Clear",
-                                                     fill="white",
-                                                     font=("Helvetica", 20, "bold"),
-                                                     anchor="center")
 
+                        self.latest = (voltages, cell_socs, overall_soc, average_voltage, overall_temp)
+                        self.render_gate.request()
+
+                        # Share alarm changes with the other views. No FRAMES publish: this
+                        # 12-cell simulated pack doesn't fit Frame (2 temps + 6 cells), and
+                        # nothing on this app's bus draws frames
+                        for name, label, active in events:
+                            self.master.bus.publish(ALARMS, AlarmEvent(name, label, active))
             except Exception as e:
                 print("Error reading sensor values:", e)
 
-        # schedule next update
-        self.after(1000, self.update_sensor_values)
+    def render_sensor_values(self):
+        if self.latest is None:
+            return
+        voltages, cell_socs, overall_soc, average_voltage, overall_temp = self.latest
+
+        # Apply alarm or normal icon update
+        if self.master.alarm_active:
+            for i, canvas in enumerate(self.center_text_canvases):
+                canvas.delete("bg")
+                canvas.create_image(0, 0, image=self.battery10_image,
+                                    anchor='nw', tags="bg")
+                canvas.tag_lower("bg")
+                canvas.itemconfig(self.center_text_items[i],
+                                  text="Safety Shutdown Active",
+                                  fill="#DEEBDD",
+                                  font=("Helvetica", 9, "bold"))
+                canvas.itemconfig(self.secondary_text_items[i],
+                                  text="", fill="white")
+        else:
+            for i, canvas in enumerate(self.center_text_canvases):
+                voltage, cell_soc = voltages[i], cell_socs[i]
+                canvas.delete("bg")
+                canvas.create_image(0, 0, image=self.image5,
+                                    anchor='nw', tags="bg")
+                canvas.tag_lower("bg")
+                canvas.itemconfig(self.center_text_items[i],
+                                  text=f"Voltage: {voltage:.2f}V",
+                                  fill="#DEEBDD")
+                canvas.itemconfig(self.secondary_text_items[i],
+                                  text=f"SoC: {cell_soc:.0f}%",
+                                  fill="#DEEBDD")
+                if self.shutdown_text_items[i] is not None:
+                    canvas.delete(self.shutdown_text_items[i])
+                    self.shutdown_text_items[i] = None
+
+        # Update overall panels
+        canvas, text_id = self.rect_text_items["SoC:"]
+        canvas.itemconfig(text_id, text=f"{overall_soc:.0f}%")
+        canvas, text_id = self.rect_text_items["Voltage:"]
+        canvas.itemconfig(text_id, text=f"{average_voltage:.2f}V")
+        canvas, text_id = self.rect_text_items["Temp:"]
+        canvas.itemconfig(text_id, text=f"{overall_temp:.0f}°C")
+
+        # Update Alarm Status panel
+        alarm_canvas, _ = self.rect_text_items["Alarm Status:"]
+        alarm_canvas.delete("all")
+        panel = self.rect27_image if self.master.alarm_active else self.rect26_image
+        alarm_canvas.create_image(0, 0, image=panel, anchor='nw')
+        alarm_canvas.create_text(panel.width()/2, 5,
+                                 text="Alarm Status:",
+                                 fill="white",
+                                 font=("Helvetica", 14, "bold"),
+                                 anchor="n")
+        alarm_canvas.create_text(panel.width()/2,
+                                 panel.height()/2,
+                                 text="Active" if self.master.alarm_active else "Clear",
+                                 fill="white",
+                                 font=("Helvetica", 20, "bold"),
+                                 anchor="center")
 
     
     def go_back(self):
@@ -517,136 +488,58 @@ class AlarmView(tk.Frame):
         self.scrollbar.pack(side="right", fill="y")
         self.log_box.config(yscrollcommand=self.scrollbar.set)
 
-        self.update_alarm_status()
-        self.update_log_view()
+        # Both panels only redraw while this view is on screen
+        self.status_gate = RenderGate(self, self.render_alarm_status)
+        self.log_gate = RenderGate(self, self.render_log_view)
+        # the bus callback runs inside the publisher's job: only mark dirty there,
+        # the NORMAL job below does the drawing within the scheduler's budget
+        bus = self.master.bus
+        self.alarm_dirty = False
+        self.alarm_sub = bus.subscribe(ALARMS, lambda ev: setattr(self, "alarm_dirty", True))
+        self.bind("<Destroy>", lambda e: e.widget is self and bus.unsubscribe(self.alarm_sub), add="+")
+        sched = FrameScheduler.for_widget(self)
+        sched.every(100, self.flush_alarm_status, NORMAL, owner=self)
+        sched.every(1000, self.update_alarm_status, NORMAL, owner=self, delay_ms=0)
+        sched.every(5000, self.update_log_view, LOW, owner=self, delay_ms=0)  # Refresh every 5 seconds
 
     def load_image(self, filename):
-        path = os.path.join(os.path.dirname(__file__), "iconsAndImages", filename)
-        if not os.path.exists(path):
-            messagebox.showerror("Error", f"Image not found: {filename}")
-            return None
-        img = Image.open(path)
-        return ImageTk.PhotoImage(img)
+        return load_asset(filename)
 
     def toggle_alarm_status(self, event):
         new_state = not self.master.alarm_active
         self.master.alarm_active = new_state
         self.master.system_view.alarm_manual_active = new_state
         print("Manual alarm override set to:", new_state)
-        self.update_alarm_status()
+        self.status_gate.request()
 
     def update_alarm_status(self):
-        alarm_active = getattr(self.master, "alarm_active", False)
-        manual_override = getattr(self.master.system_view, "alarm_manual_active", False)
-
-        if alarm_active:
-            self.bg_image_label.config(image=self.red_rect_image)
-            self.status_label.config(text="Alarm Status: Active", bg="#FF5A55")
-            reason = "Manual override activated" if manual_override else "Temperature exceeded 20°C"
-        else:
-            self.bg_image_label.config(image=self.green_rect_image)
-            self.status_label.config(text="Alarm Status: Clear", bg="#2DC295")
-            reason = "System operating within normal limits"
-
-        self.reason_label.config(text=f"Reason: {reason}")
-        self.after(1000, self.update_alarm_status)
-
-    def update_log_view(self):
-        log_path = os.path.join(os.path.dirname(__file__), "alarm.log")
-        if os.path.exists(log_path):
-            with open(log_path, "r") as f:
-                lines = f.readlines()[-100:]  # Limit to last 100 entries
-                formatted = [
-                    self.format_log_line(line.strip())
-                    for line in lines if line.strip()
-                ]
-                self.log_box.config(state="normal")
-                self.log_box.delete(1.0, "end")
-                self.log_box.insert("end", "\n".join(formatted))
-                self.log_box.config(state="disabled")
-        self.after(5000, self.update_log_view)  # Refresh every 5 seconds
+        self.alarm_dirty = False
+        self.status_gate.request()
 
-    def format_log_line(self, line):
-        try:
-            time_part, msg = line.split(" - ", 1)
-            timestamp = time_part.split(",")[0]
-            return f"[{timestamp[-8:]}] {msg}"
-        except:
-            return line
-
-    def __init__(self, parent):
-        super().__init__(parent, bg="#063028")
-
-        # Load status background images
-        self.green_rect_image = self.load_image("greenRectangle.png")
-        self.red_rect_image = self.load_image("redRectangle.png")
+    def flush_alarm_status(self):
+        if self.alarm_dirty:
+            self.update_alarm_status()
 
-        # Status image and label
-        self.bg_image_label = tk.Label(self, bg="#063028")
-        self.bg_image_label.pack(pady=40)
-        self.bg_image_label.bind("<Button-1>", self.toggle_alarm_status)
-
-        self.status_label = tk.Label(self.bg_image_label, text="", font=("Helvetica", 20, "bold"),
-                                     bg="#2DC295", fg="#DEEBDD")
-        self.status_label.place(relx=0.5, rely=0.5, anchor="center")
-
-        self.reason_label = tk.Label(self, text="", font=("Helvetica", 14),
-                                     bg="#063028", fg="#DEEBDD")
-        self.reason_label.pack(pady=(5, 20))
-
-        # 🔙 Back arrow only (no 'Back' text)
-        lbl_arrow = tk.Label(self, image=self.master.arrow_image, bg="#063028")
-        lbl_arrow.place(x=20, y=20)
-        lbl_arrow.bind("<Button-1>", lambda e: self.master.show_view(self.master.navigation_view))
-
-        # 🧾 Log history viewer
-        self.log_label = tk.Label(self, text="Alarm History", font=("Helvetica", 16, "bold"),
-                                  bg="#063028", fg="white")
-        self.log_label.pack()
-
-        self.log_box = tk.Text(self, height=8, width=80, bg="#021B17", fg="#DEEBDD",
-                               font=("Courier", 12), state="disabled")
-        self.log_box.pack(pady=5)
-
-        self.scrollbar = tk.Scrollbar(self, command=self.log_box.yview)
-        self.scrollbar.pack(side="right", fill="y")
-        self.log_box.config(yscrollcommand=self.scrollbar.set)
-
-        self.update_alarm_status()
-        self.update_log_view()
-
-    def load_image(self, filename):
-        path = os.path.join(os.path.dirname(__file__), "iconsAndImages", filename)
-        if not os.path.exists(path):
-            messagebox.showerror("Error", f"Image not found: {filename}")
-            return None
-        img = Image.open(path)
-        return ImageTk.PhotoImage(img)
-
-    def toggle_alarm_status(self, event):
-        new_state = not self.master.alarm_active
-        self.master.alarm_active = new_state
-        self.master.system_view.alarm_manual_active = new_state
-        print("Manual alarm override set to:", new_state)
-        self.update_alarm_status()
-
-    def update_alarm_status(self):
+    def render_alarm_status(self):
         alarm_active = getattr(self.master, "alarm_active", False)
         manual_override = getattr(self.master.system_view, "alarm_manual_active", False)
 
         if alarm_active:
             self.bg_image_label.config(image=self.red_rect_image)
             self.status_label.config(text="Alarm Status: Active", bg="#FF5A55")
-            reason = "Manual override activated" if manual_override else "Temperature exceeded 40°C"
+            reasons = getattr(self.master, "alarm_reasons", [])
+            reason = "Manual override activated" if manual_override else ", ".join(reasons)
         else:
             self.bg_image_label.config(image=self.green_rect_image)
             self.status_label.config(text="Alarm Status: Clear", bg="#2DC295")
             reason = "System operating within normal limits"
 
         self.reason_label.config(text=f"Reason: {reason}")
-        self.after(1000, self.update_alarm_status)
 
     def update_log_view(self):
+        self.log_gate.request()
+
+    def render_log_view(self):
         log_path = os.path.join(os.path.dirname(__file__), "alarm.log")
         if os.path.exists(log_path):
             with open(log_path, "r") as f:
@@ -659,7 +552,6 @@ class AlarmView(tk.Frame):
                 self.log_box.delete(1.0, "end")
                 self.log_box.insert("end", "\n".join(formatted))
                 self.log_box.config(state="disabled")
-        self.after(5000, self.update_log_view)  # Refresh every 5 seconds
 
     def format_log_line(self, line):
         try:
@@ -724,12 +616,10 @@ class BMSApp(tk.Tk):
         self.title("Battery Management System")
         self.geometry("1280x720")
         self.configure(bg="#063028")
-        self.arrow_image = self.load_arrow_image()
-        self.navigation_view = NavigationView(self)
-        self.system_view = SystemView(self)
-        self.alarm_view = AlarmView(self)
-        self.about_view = AboutView(self)
-        self.alarm_active = False            
+        self._views = {}                     # built on first navigation, see view()
+        self.bus = Bus()
+        self.alarm_active = False
+        self.alarm_reasons = []
         self.login_frame = None
         self.registration_frame = None
         self.current_view = None
@@ -737,13 +627,23 @@ class BMSApp(tk.Tk):
 
 
     
-    def load_arrow_image(self):
-        arrow_img_path = os.path.join(os.path.dirname(__file__), "iconsAndImages", "Arrow 1.png")
-        if not os.path.exists(arrow_img_path):
-            messagebox.showerror("Error", f"Arrow 1 image not found: {arrow_img_path}")
-            return None
-        arrow_img = Image.open(arrow_img_path)
-        return ImageTk.PhotoImage(arrow_img)
+    VIEW_CLASSES = {"navigation_view": NavigationView, "system_view": SystemView,
+                    "alarm_view": AlarmView, "about_view": AboutView}
+
+    def view(self, name):
+        frame = self._views.get(name)
+        if frame is None:
+            frame = self._views[name] = self.VIEW_CLASSES[name](self)
+        return frame
+
+    navigation_view = property(lambda self: self.view("navigation_view"))
+    system_view = property(lambda self: self.view("system_view"))
+    alarm_view = property(lambda self: self.view("alarm_view"))
+    about_view = property(lambda self: self.view("about_view"))
+
+    @property
+    def arrow_image(self):
+        return load_asset("Arrow 1.png")
     
     def show_view(self, view_frame):
         if self.current_view is not None:
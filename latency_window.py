@@ -0,0 +1,52 @@
+import tkinter as tk, math
+from visibility import RenderGate
+from scheduler import FrameScheduler, LOW
+from timing import STAGES
+
+W, H_ROW, PAD = 520, 120, 30
+TITLES = {"transport": "board → host", "display": "host → screen", "total": "board → screen"}
+
+def fmt_ms(s: float) -> str:
+    return "--" if math.isnan(s) else f"{s * 1000:.1f} ms"
+
+class LatencyWindow(tk.Toplevel):
+    """Live end-to-end latency histograms (log time axis, one row per stage)."""
+
+    def __init__(self, hist, dropped=lambda: 0):
+        super().__init__()
+        self.title("Frame Latency")
+        self.configure(bg="#1e1e1e")
+        self.hist, self.dropped = hist, dropped
+        self.canvas = tk.Canvas(self, width=W, height=len(STAGES) * H_ROW + PAD,
+                                bg="#1e1e1e", highlightthickness=0)
+        self.canvas.pack(padx=10, pady=10)
+        self.info = tk.Label(self, fg="white", bg="#1e1e1e", font=("Consolas", 10))
+        self.info.pack(pady=(0, 8))
+        self.render_gate = RenderGate(self, self._draw)
+        FrameScheduler.for_widget(self).every(1000, self.render_gate.request, LOW, owner=self, delay_ms=0)
+
+    def _draw(self):
+        cv, edges = self.canvas, self.hist.edges
+        cv.delete("all")
+        lo, hi = math.log10(edges[0]), math.log10(edges[-1])
+        x_of = lambda s: 10 + (math.log10(s) - lo) / (hi - lo) * (W - 20)
+        for row, stage in enumerate(STAGES):
+            counts = self.hist.counts[stage][1:-1]      # drop under / overflow
+            top, base = row * H_ROW + 18, (row + 1) * H_ROW - 6
+            peak = counts.max() or 1
+            cv.create_text(10, top - 10, anchor="w", fill="#4fc3f7", font=("Consolas", 10),
+                           text=f"{TITLES[stage]}   p50 {fmt_ms(self.hist.percentile(stage, 50))}"
+                                f"   p95 {fmt_ms(self.hist.percentile(stage, 95))}"
+                                f"   p99 {fmt_ms(self.hist.percentile(stage, 99))}")
+            for i, c in enumerate(counts):
+                if c:
+                    h = (base - top) * c / peak
+                    cv.create_rectangle(x_of(edges[i]), base - h, x_of(edges[i + 1]), base,
+                                        fill="#70d000", width=0)
+            cv.create_line(10, base, W - 10, base, fill="#555")
+        y = len(STAGES) * H_ROW + 10
+        for s in (1e-3, 1e-2, 1e-1, 1.0):
+            cv.create_text(x_of(s), y, fill="#aaa", font=("Consolas", 9),
+                           text=f"{s * 1000:g} ms" if s < 1 else f"{s:g} s")
+        self.info.config(text=f"{self.hist.total('total')} frames   "
+                              f"{self.dropped()} lost on the link")
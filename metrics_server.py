@@ -0,0 +1,222 @@
+"""
+Local live-data endpoint
+──────────────────────────────────────────────────────────────
+• Embedded HTTP server (stdlib only), 127.0.0.1 by default:
+      /            tiny live page
+      /metrics     Prometheus text format
+      /api/state   JSON snapshot
+      /ws          WebSocket, pushes the JSON snapshot on change
+• Fed by bus subscribers on the Tk thread: each one only copies
+  the latest values into a snapshot under a lock; HTTP and
+  WebSocket clients are served from their own threads, so any
+  number of viewers add no work to the Tk loop or serial port
+• Push rate is capped (PUSH_HZ); slow WebSocket clients are
+  dropped instead of buffering
+──────────────────────────────────────────────────────────────
+"""
+
+import base64, hashlib, json, math, socket, struct, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bus import FRAMES, RELAY, ALARMS, SESSION
+
+HOST, PORT = "127.0.0.1", 8765
+PUSH_HZ = 10
+_WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+PAGE = b"""<!doctype html><meta charset="utf-8"><title>BMS live</title>
+<style>body{font:14px monospace;background:#1e1e1e;color:#eee}pre{font-size:15px}</style>
+<h3>BMS live data</h3><pre id="s">connecting...</pre>
+<script>
+const ws = new WebSocket(`ws://${location.host}/ws`);
+ws.onmessage = e => document.getElementById("s").textContent = JSON.stringify(JSON.parse(e.data), null, 2);
+ws.onclose = () => document.getElementById("s").textContent += "\\n(disconnected)";
+</script>"""
+
+
+def _num(v):
+    return None if v is None or (isinstance(v, float) and not math.isfinite(v)) else v
+
+
+class MetricsState:
+    """Latest values, written on the Tk thread, read by server threads."""
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.version = 0
+        self.frame = None
+        self.relays = {}            # name → on
+        self.alarms = {}            # name → label (active only)
+        self.alarm_changes = 0
+        self.session = None
+        self.counters = {}
+
+    def update(self, **kw):
+        with self.cond:
+            for k, v in kw.items():
+                setattr(self, k, v)
+            self.version += 1
+            self.cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self.cond:
+            f = self.frame
+            return {
+                "version": self.version,
+                "frame": None if f is None else {
+                    "seq": f.seq, "t": _num(f.t), "t_batt": _num(f.t_batt), "t_heat": _num(f.t_heat),
+                    "cells": [_num(v) for v in f.cells], "pack_v": _num(f.pack_v)},
+                "relays": dict(self.relays),
+                "alarms": dict(self.alarms),
+                "session": self.session,
+                "alarm_changes": self.alarm_changes,
+                "counters": {k: _num(v) for k, v in self.counters.items()},
+            }
+
+
+def _label(v) -> str:
+    """Prometheus label value: backslash, double quote and newline escaped."""
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus(snap: dict) -> str:
+    out = []
+
+    def metric(name, help_, value, labels=None, kind="gauge"):
+        if not any(line.startswith(f"# HELP bms_{name} ") for line in out):
+            out.append(f"# HELP bms_{name} {help_}")
+            out.append(f"# TYPE bms_{name} {kind}")
+        lab = "{" + ",".join(f'{k}="{_label(v)}"' for k, v in labels.items()) + "}" if labels else ""
+        out.append(f"bms_{name}{lab} {'NaN' if value is None else value}")
+
+    f = snap["frame"]
+    if f:
+        for i, v in enumerate(f["cells"]):
+            metric("cell_voltage_volts", "Cell voltage", v, {"cell": i + 1})
+        metric("pack_voltage_volts", "Pack voltage", f["pack_v"])
+        metric("temperature_celsius", "Temperature", f["t_batt"], {"sensor": "battery"})
+        metric("temperature_celsius", "Temperature", f["t_heat"], {"sensor": "heater"})
+        metric("frame_seq", "Last frame sequence number", f["seq"])
+    for name, on in snap["relays"].items():
+        metric("relay_on", "Relay state (1 = on)", int(on), {"relay": name})
+    metric("alarms_active", "Number of active alarms", len(snap["alarms"]))
+    for name, label in snap["alarms"].items():
+        metric("alarm_active", "Active alarm", 1, {"alarm": name, "label": label})
+    metric("alarm_transitions_total", "Alarm raise / clear events", snap["alarm_changes"], kind="counter")
+    metric("session_active", "Auto-Pilot session running", int(snap["session"] is not None))
+    for name, v in snap["counters"].items():
+        metric(name, f"Pipeline counter {name}", _num(v), kind="counter" if name.endswith("_total") else "gauge")
+    return "\n".join(out) + "\n"
+
+
+# ── WebSocket (server → client text frames only) ──────────────
+def _ws_frame(text: str) -> bytes:
+    data = text.encode()
+    n = len(data)
+    if n < 126:
+        hdr = struct.pack("!BB", 0x81, n)
+    elif n < 1 << 16:
+        hdr = struct.pack("!BBH", 0x81, 126, n)
+    else:
+        hdr = struct.pack("!BBQ", 0x81, 127, n)
+    return hdr + data
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "BMSMetrics/1.0"
+    protocol_version = "HTTP/1.1"         # browsers refuse a WebSocket upgrade over 1.0
+
+    def log_message(self, *args):         # keep the console quiet
+        pass
+
+    def _send(self, body: bytes, ctype: str):
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        state = self.server.state
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            self._send(prometheus(state.snapshot()).encode(), "text/plain; version=0.0.4")
+        elif path == "/api/state":
+            self._send(json.dumps(state.snapshot(), allow_nan=False).encode(), "application/json")
+        elif path == "/ws" and self.headers.get("Upgrade", "").lower() == "websocket":
+            self._websocket(state)
+        elif path == "/":
+            self._send(PAGE, "text/html; charset=utf-8")
+        else:
+            self.send_error(404)
+
+    def _websocket(self, state):
+        key = self.headers.get("Sec-WebSocket-Key", "")
+        accept = base64.b64encode(hashlib.sha1((key + _WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.connection.settimeout(5)             # a stalled client is dropped, not buffered
+        seen, period = -1, 1.0 / PUSH_HZ
+        try:
+            while not self.server.stopping:
+                with state.cond:
+                    state.cond.wait_for(lambda: state.version != seen or self.server.stopping, timeout=15)
+                snap = state.snapshot()
+                if snap["version"] == seen:
+                    self.connection.sendall(b"\x89\x00")      # ping keeps idle proxies open
+                    continue
+                seen = snap["version"]
+                self.connection.sendall(_ws_frame(json.dumps(snap, allow_nan=False)))
+                time.sleep(period)
+        except (OSError, socket.timeout):
+            pass
+        self.close_connection = True
+
+
+class MetricsServer:
+    def __init__(self, bus, counters=None, host: str = HOST, port: int = PORT):
+        """counters(): {name: number}, called on the Tk thread with each frame snapshot."""
+        self.state = MetricsState()
+        self.counters = counters
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.state, self.httpd.stopping = self.state, False
+        self.subs = [bus.subscribe(FRAMES, self._on_frame, max_hz=PUSH_HZ),
+                     bus.subscribe(RELAY, self._on_relay),
+                     bus.subscribe(ALARMS, self._on_alarm),
+                     bus.subscribe(SESSION, self._on_session)]
+        self.bus = bus
+        threading.Thread(target=self.httpd.serve_forever, name="metrics-http", daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    # bus subscribers (Tk thread): copy, never block
+    def _on_frame(self, frame):
+        self.state.update(frame=frame, counters=self.counters() if self.counters else {})
+
+    def _on_relay(self, ev):
+        self.state.update(relays={**self.state.relays, ev.name: ev.on})
+
+    def _on_alarm(self, ev):
+        alarms = dict(self.state.alarms)
+        if ev.active: alarms[ev.name] = ev.label
+        else: alarms.pop(ev.name, None)
+        self.state.update(alarms=alarms, alarm_changes=self.state.alarm_changes + 1)
+
+    def _on_session(self, ev):
+        self.state.update(session=ev.path if ev.kind == "start" else None)
+
+    def close(self):
+        for sub in self.subs:
+            self.bus.unsubscribe(sub)
+        self.httpd.stopping = True
+        self.state.update()                  # wake WebSocket threads
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,94 @@
+"""
+Central frame scheduler
+──────────────────────────────────────────────────────────────
+• One after() tick per Tk root drives every periodic UI job
+• Jobs declare a period and a priority:
+      HIGH   – data / control, always runs when due
+      NORMAL – rendering
+      LOW    – log views, statistics
+• Each tick has a time budget; once it is spent, due NORMAL /
+  LOW jobs wait for the next tick (oldest first, never more
+  than MAX_DEFER ticks), so a slow frame can't snowball into
+  an unresponsive window
+──────────────────────────────────────────────────────────────
+"""
+
+import time, traceback
+import tkinter as tk
+
+HIGH, NORMAL, LOW = 0, 1, 2
+TICK_MS   = 20
+BUDGET_MS = 12
+MAX_DEFER = 5           # a job skipped this many ticks in a row runs regardless
+
+
+class Job:
+    __slots__ = ("fn", "period", "priority", "owner", "due", "deferred")
+
+    def __init__(self, fn, period_s, priority, owner, due):
+        self.fn, self.period, self.priority, self.owner = fn, period_s, priority, owner
+        self.due, self.deferred = due, 0
+
+
+class FrameScheduler:
+    def __init__(self, root, tick_ms: int = TICK_MS, budget_ms: float = BUDGET_MS):
+        self.root = root
+        self.tick_ms, self.budget = tick_ms, budget_ms / 1000
+        self.jobs = []
+        self.overruns = 0
+        self._running = False
+
+    @classmethod
+    def for_widget(cls, widget) -> "FrameScheduler":
+        """The scheduler shared by every window of `widget`'s Tk root."""
+        root = widget._root()
+        sched = getattr(root, "_frame_scheduler", None)
+        if sched is None:
+            sched = root._frame_scheduler = cls(root)
+        return sched
+
+    def every(self, period_ms: int, fn, priority: int = NORMAL, owner=None, delay_ms: int = None) -> Job:
+        """Run fn() every period_ms; stops by itself once `owner` is destroyed."""
+        first = time.monotonic() + (period_ms if delay_ms is None else delay_ms) / 1000
+        job = Job(fn, period_ms / 1000, priority, owner, first)
+        self.jobs.append(job)
+        if not self._running:
+            self._running = True
+            self.root.after(self.tick_ms, self._tick)
+        return job
+
+    def cancel(self, job: Job):
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def _alive(self, job) -> bool:
+        if job.owner is None:
+            return True
+        try:
+            return bool(job.owner.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def _tick(self):
+        start = time.monotonic()
+        due = sorted((j for j in self.jobs if j.due <= start), key=lambda j: (j.priority, j.due))
+        for job in due:
+            if job.priority > HIGH and job.deferred < MAX_DEFER \
+                    and time.monotonic() - start > self.budget:
+                job.deferred += 1
+                continue
+            if not self._alive(job):
+                self.cancel(job); continue
+            try:
+                job.fn()
+            except Exception:
+                traceback.print_exc()
+            job.deferred = 0
+            # next slot on the period grid; skip missed slots instead of bursting
+            job.due = max(job.due + job.period, time.monotonic())
+        if time.monotonic() - start > self.budget:
+            self.overruns += 1
+        try:
+            self.root.after(self.tick_ms, self._tick)
+        except tk.TclError:            # root destroyed
+            self._running = False
@@ -0,0 +1,201 @@
+"""
+Asyncio serial core
+──────────────────────────────────────────────────────────────
+• One event loop (own thread) serves any number of ports
+• LineProtocol: incremental framing of the byte stream into
+  lines – the loop wakes when bytes arrive, no read timeouts
+• SerialLink: DATA lines → on_frame(raw frame stamped with its
+  receive time); relay commands go through one write queue
+  per port and each resolves once the board answers
+  ACK,<pin>,<state> (retried, then False)
+• Transport: pyserial-asyncio when installed, otherwise the
+  port's file descriptor is watched with loop.add_reader()
+  (POSIX; Windows needs pyserial-asyncio)
+• Hand-off to Tk: callbacks run on the loop thread, so give
+  them something thread-safe (queue.put); commands from Tk go
+  in through SerialHub (run_coroutine_threadsafe)
+──────────────────────────────────────────────────────────────
+"""
+
+import asyncio, threading, time
+import serial
+
+from acquisition import parse_line
+
+try:
+    import serial_asyncio
+except ImportError:
+    serial_asyncio = None
+
+RELAY_PINS    = (2, 3, 4, 5)   # relay id 1–4 → board pin echoed in ACK
+ACK_TIMEOUT_S = 0.3
+ACK_RETRIES   = 2
+MAX_LINE      = 256            # bytes; longer garbage without a newline is dropped
+
+
+class LineProtocol(asyncio.Protocol):
+    def __init__(self, link):
+        self.link = link
+        self.buf = bytearray()
+
+    def connection_made(self, transport):
+        self.link.transport = transport
+
+    def data_received(self, data: bytes):
+        self.buf += data
+        end = self.buf.rfind(b"\n")
+        if end < 0:
+            if len(self.buf) > MAX_LINE:
+                self.buf.clear()
+            return
+        chunk = bytes(self.buf[:end])
+        del self.buf[:end + 1]
+        for raw in chunk.split(b"\n"):
+            self.link.on_line(raw.decode(errors="ignore").strip())
+
+    def connection_lost(self, exc):
+        self.link.on_lost(exc)
+
+
+class _FdTransport:
+    """Minimal transport over a non-blocking pyserial port via add_reader()."""
+
+    def __init__(self, loop, ser, protocol):
+        self.loop, self.ser, self.protocol = loop, ser, protocol
+        loop.add_reader(ser.fileno(), self._readable)
+        protocol.connection_made(self)
+
+    def _readable(self):
+        try:
+            data = self.ser.read(self.ser.in_waiting or 1)
+        except serial.SerialException as e:
+            self.close(e); return
+        if data:
+            self.protocol.data_received(data)
+
+    def write(self, data: bytes):
+        try:
+            self.ser.write(data)
+        except serial.SerialException as e:
+            self.close(e)
+
+    def close(self, exc=None):
+        if self.ser is None:
+            return
+        self.loop.remove_reader(self.ser.fileno())
+        try: self.ser.close()
+        except Exception: pass
+        self.ser = None
+        self.protocol.connection_lost(exc)
+
+
+class SerialLink:
+    def __init__(self, port: str, baud: int, on_frame, on_error=None):
+        self.port, self.baud = port, baud
+        self.on_frame, self.on_error = on_frame, on_error
+        self.transport = None
+        self._acks = {}                         # board pin → future of the ACKed state
+        self._writes = None
+        self._writer = None
+
+    async def open(self):
+        loop = asyncio.get_running_loop()
+        if serial_asyncio:
+            await serial_asyncio.create_serial_connection(
+                loop, lambda: LineProtocol(self), self.port, baudrate=self.baud)
+        else:
+            ser = serial.Serial(self.port, self.baud, timeout=0, write_timeout=1)
+            ser.reset_input_buffer()
+            _FdTransport(loop, ser, LineProtocol(self))
+        self._writes = asyncio.Queue()
+        self._writer = loop.create_task(self._write_loop())
+        return self
+
+    def on_line(self, line: str):
+        if line.startswith("DATA"):
+            frame = parse_line(line, time.time())
+            if frame:
+                self.on_frame(frame)
+        elif line.startswith("ACK"):
+            try:
+                _, pin, state = line.split(",")
+                fut = self._acks.pop(int(pin), None)
+            except ValueError:
+                return
+            if fut and not fut.done():
+                fut.set_result(int(state))
+
+    def on_lost(self, exc):
+        self.transport = None
+        if self._writer:
+            self._writer.cancel()
+        while self._writes and not self._writes.empty():
+            *_, done = self._writes.get_nowait()
+            if not done.done(): done.set_result(False)
+        if exc and self.on_error:
+            self.on_error(f"{self.port}: {exc}")
+
+    async def send_relay(self, relay: int, on: bool) -> bool:
+        """Queue S,<relay>,<on>; True once the board ACKs that state, False if it never can."""
+        if self._writer is None or self._writer.done():
+            return False                        # link lost / closed: nothing would write it
+        done = asyncio.get_running_loop().create_future()
+        await self._writes.put((relay, bool(on), done))
+        return await done
+
+    async def _write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            relay, on, done = await self._writes.get()
+            pin, ok = RELAY_PINS[relay - 1], False
+            try:
+                for _ in range(1 + ACK_RETRIES):
+                    if self.transport is None:
+                        break
+                    ack = self._acks[pin] = loop.create_future()
+                    self.transport.write(f"S,{relay},{int(on)}\n".encode())
+                    try:
+                        ok = await asyncio.wait_for(ack, ACK_TIMEOUT_S) == int(on)
+                        break
+                    except asyncio.TimeoutError:
+                        pass
+            finally:                            # also when cancelled by on_lost / close
+                self._acks.pop(pin, None)
+                if not done.done():
+                    done.set_result(ok)
+
+    def close(self):
+        if self._writer:
+            self._writer.cancel()               # resolves the in-flight command as not ACKed
+        if self.transport:
+            self.transport.close()
+
+
+class SerialHub:
+    """Event loop thread owning every SerialLink; thread-safe front end for Tk."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.links = []
+        self._thread = threading.Thread(target=self.loop.run_forever, name="serial-hub", daemon=True)
+        self._thread.start()
+
+    def open(self, port: str, baud: int, on_frame, on_error=None, timeout: float = 2.0) -> SerialLink:
+        """Blocks until the port is open; raises serial.SerialException / OSError on failure."""
+        link = SerialLink(port, baud, on_frame, on_error)
+        asyncio.run_coroutine_threadsafe(link.open(), self.loop).result(timeout)
+        self.links.append(link)
+        return link
+
+    def send_relay(self, link: SerialLink, relay: int, on: bool, done=None):
+        """Fire-and-forget from any thread; done(ok) is called on the loop thread."""
+        cf = asyncio.run_coroutine_threadsafe(link.send_relay(relay, on), self.loop)
+        if done:
+            cf.add_done_callback(lambda f: done(not f.cancelled() and f.exception() is None and f.result()))
+        return cf
+
+    def close(self):
+        for link in self.links:
+            self.loop.call_soon_threadsafe(link.close)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(1.0)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Session log batch tool
+──────────────────────────────────────────────────────────────
+Scans a directory of session_*.xlsx files (Dashboard Auto-Pilot
+logs) and summarizes them in parallel, one process per core.
+Workbooks are streamed (openpyxl read_only, values only).
+
+Per session:
+  rows, duration, heating time (HeatStart → heater off),
+  heater-on time, battery start / max temp, overshoot above
+  the set-point, SOC start / end / delta
+
+    python session_tool.py                      # LOG_DIR, table to stdout
+    python session_tool.py ~/DATA -o summary.csv
+    python session_tool.py ~/DATA --csv-dir csv/    # also convert each to CSV
+    python session_tool.py ~/DATA --setpoint 25     # logs without a Setpoint column
+──────────────────────────────────────────────────────────────
+pip install numpy openpyxl
+"""
+
+import argparse, csv, glob, math, os, sys
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+LOG_DIR = "/Users/princed/Desktop/DATA/"
+DEFAULT_SETPOINT = 20.0
+
+SUMMARY_COLS = ("session", "rows", "duration_s", "heat_time_s", "heater_on_s",
+                "tBatt_start", "tBatt_max", "setpoint", "overshoot_C",
+                "SOC_start", "SOC_end", "SOC_delta")
+
+
+def read_session(path: str):
+    """(header, {column: float array}) – blanks / text become NaN."""
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows, ())]
+        data = [[v if isinstance(v, (int, float)) else math.nan for v in r] for r in rows if r]
+    finally:
+        wb.close()
+    arr = np.array(data, dtype=float).reshape(-1, len(header))
+    return header, {h: arr[:, i] for i, h in enumerate(header)}
+
+
+def _first(a: np.ndarray) -> float:
+    i = np.flatnonzero(np.isfinite(a))
+    return float(a[i[0]]) if len(i) else math.nan
+
+
+def _last(a: np.ndarray) -> float:
+    i = np.flatnonzero(np.isfinite(a))
+    return float(a[i[-1]]) if len(i) else math.nan
+
+
+def summarize(path: str, setpoint: float = DEFAULT_SETPOINT, csv_dir: str = None) -> dict:
+    header, col = read_session(path)
+    nan = np.full(len(next(iter(col.values()), [])), math.nan)
+    t, tb = col.get("t_s", nan), col.get("tBatt", nan)
+    heater, soc = col.get("Heater", nan), col.get("SOC%", nan)
+
+    if csv_dir:
+        out = os.path.join(csv_dir, os.path.splitext(os.path.basename(path))[0] + ".csv")
+        np.savetxt(out, np.column_stack(list(col.values())) if col else np.empty((0, 0)),
+                   delimiter=",", header=",".join(header), comments="", fmt="%.6g")
+
+    sp = col.get("Setpoint")
+    sp = _first(sp) if sp is not None and np.isfinite(sp).any() else setpoint
+    dt = np.diff(t, append=t[-1] if len(t) else 0)
+    tb_max = float(np.nanmax(tb)) if np.isfinite(tb).any() else math.nan
+    reached = np.flatnonzero(tb >= sp)
+    return {
+        "session": os.path.basename(path),
+        "rows": len(t),
+        "duration_s": _last(t) - _first(t),
+        "heat_time_s": _first(col.get("Heat∆s", nan)),
+        "heater_on_s": float(np.nansum(dt[heater > 0.5])),
+        "tBatt_start": _first(tb),
+        "tBatt_max": tb_max,
+        "setpoint": sp,
+        # overshoot only counts once the set-point was actually reached
+        "overshoot_C": max(0.0, tb_max - sp) if len(reached) else 0.0,
+        "SOC_start": _first(soc),
+        "SOC_end": _last(soc),
+        "SOC_delta": _last(soc) - _first(soc),
+    }
+
+
+def _job(args):
+    path, setpoint, csv_dir = args
+    try:
+        return summarize(path, setpoint, csv_dir)
+    except Exception as e:                      # one broken workbook shouldn't stop the batch
+        return {"session": os.path.basename(path), "error": str(e)}
+
+
+def fmt(v) -> str:
+    if isinstance(v, float):
+        return "" if math.isnan(v) else f"{v:.2f}"
+    return str(v)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("log_dir", nargs="?", default=LOG_DIR)
+    ap.add_argument("--pattern", default="session_*.xlsx")
+    ap.add_argument("--setpoint", type=float, default=DEFAULT_SETPOINT,
+                    help="for logs written before the Setpoint column existed")
+    ap.add_argument("-o", "--output", help="write the summary table as CSV")
+    ap.add_argument("--csv-dir", help="also convert every session to CSV here")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    args = ap.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(os.path.expanduser(args.log_dir), args.pattern)))
+    if not paths:
+        sys.exit(f"No {args.pattern} in {args.log_dir}")
+    if args.csv_dir:
+        os.makedirs(args.csv_dir, exist_ok=True)
+
+    jobs = [(p, args.setpoint, args.csv_dir) for p in paths]
+    with ProcessPoolExecutor(args.jobs) as pool:
+        results = list(pool.map(_job, jobs, chunksize=max(1, len(jobs) // (4 * (os.cpu_count() or 1)))))
+
+    ok = [r for r in results if "error" not in r]
+    for r in results:
+        if "error" in r:
+            print(f"skipped {r['session']}: {r['error']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            w = csv.DictWriter(f, SUMMARY_COLS)
+            w.writeheader(); w.writerows(ok)
+
+    widths = [max(len(c), *(len(fmt(r[c])) for r in ok)) if ok else len(c) for c in SUMMARY_COLS]
+    print("  ".join(c.rjust(w) for c, w in zip(SUMMARY_COLS, widths)))
+    for r in ok:
+        print("  ".join(fmt(r[c]).rjust(w) for c, w in zip(SUMMARY_COLS, widths)))
+    print(f"\n{len(ok)} sessions, {len(results) - len(ok)} skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Host-side signal conditioning for the ADC tap channels
+──────────────────────────────────────────────────────────────
+• Per-channel gain / offset calibration, stored in JSON
+• Filter bank: running median (spike removal) followed by a
+  single-pole IIR low-pass, vectorized across all channels
+• Non-finite samples pass through as NaN and leave the
+  filter state untouched
+──────────────────────────────────────────────────────────────
+"""
+
+import json, os, warnings
+import numpy as np
+
+CAL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adc_calibration.json")
+
+
+class SignalConditioner:
+    def __init__(self, gain, offset, median: int = 0, alpha: float = 1.0):
+        self.gain = np.asarray(gain, dtype=float)
+        self.offset = np.asarray(offset, dtype=float)
+        self.n_ch = len(self.gain)
+        self.median = max(int(median), 0)
+        self.alpha = float(alpha)          # 1.0 → IIR disabled
+        self.reset()
+
+    @classmethod
+    def from_file(cls, path: str = CAL_FILE, n_ch: int = 6):
+        cfg = {}
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                cfg = json.load(f)
+        flt = cfg.get("filter", {})
+        return cls(cfg.get("gain", [1.0] * n_ch), cfg.get("offset", [0.0] * n_ch),
+                   flt.get("median", 0), flt.get("alpha", 1.0))
+
+    def save(self, path: str = CAL_FILE):
+        cfg = {"gain": self.gain.tolist(), "offset": self.offset.tolist(),
+               "filter": {"median": self.median, "alpha": self.alpha}}
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(cfg, f, indent=2)
+        os.replace(tmp, path)
+
+    def reset(self):
+        self._win = np.full((max(self.median, 1), self.n_ch), np.nan)
+        self._pos = 0
+        self._iir = np.full(self.n_ch, np.nan)
+
+    def process(self, raw) -> np.ndarray:
+        """raw: (n_ch,) or (n_frames, n_ch) → calibrated, filtered array of the same shape."""
+        x = np.asarray(raw, dtype=float) * self.gain + self.offset
+        single = x.ndim == 1
+        rows = np.atleast_2d(x)
+        out = np.empty_like(rows)
+        for k, row in enumerate(rows):
+            out[k] = self._step(row)
+        return out[0] if single else out
+
+    def _step(self, x: np.ndarray) -> np.ndarray:
+        ok = np.isfinite(x)
+        if self.median > 1:
+            self._win[self._pos] = np.where(ok, x, self._win[self._pos - 1])
+            self._pos = (self._pos + 1) % self.median
+            with warnings.catch_warnings():     # all-NaN column until a channel reports
+                warnings.simplefilter("ignore", RuntimeWarning)
+                x_med = np.nanmedian(self._win, axis=0)
+        else:
+            x_med = x
+        seed = np.isnan(self._iir)
+        self._iir = np.where(ok, np.where(seed, x_med, self._iir + self.alpha * (x_med - self._iir)),
+                             self._iir)
+        return np.where(ok, self._iir, np.nan)
+
+    def calibrate(self, channel: int, raw_a: float, true_a: float, raw_b: float, true_b: float):
+        """Two-point calibration of one channel from reference readings."""
+        g = (true_b - true_a) / (raw_b - raw_a)
+        self.gain[channel], self.offset[channel] = g, true_a - g * raw_a
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Offline Auto-Pilot benchmark
+──────────────────────────────────────────────────────────────
+Runs each controller (control.CONTROLLERS) against a simulated
+heater / battery plant (thermal_model.py) at the dashboard's
+frame rate. The DS18B20 readings are quantized to 0.5 °C with
+noise, like the 9-bit sensors. It reports:
+
+  time to set-point, overshoot, heater / pump relay cycles,
+  heater energy and RMS error once the set-point was reached
+
+    python sim_autopilot.py                        # defaults
+    python sim_autopilot.py --setpoint 25 --start 0 --minutes 60
+    python sim_autopilot.py --mismatch 0.3         # plant ≠ model by ±30 %
+    python sim_autopilot.py --fit ~/DATA           # fit thermal_model.json first
+
+Without a fitted thermal_model.json both the plant and the
+controller's model are thermal_model.DEFAULTS, so the numbers
+compare controllers on a guessed plant, not this rig
+──────────────────────────────────────────────────────────────
+"""
+
+import argparse, glob, math, os
+import numpy as np
+
+from control import CONTROLLERS, HEATER, PUMP, PredictiveController
+from thermal_model import ThermalModel, session_arrays
+
+FRAME_S  = 0.1         # 10 Hz, as the firmware pushes
+HEATER_W = 150.0       # nominal heater power, for the energy figure
+SENSOR_Q = 0.5         # °C, DS18B20 at 9-bit resolution
+NOISE_C  = 0.1
+
+
+def simulate(ctrl, plant: ThermalModel, setpoint: float, start: float, minutes: float, rng) -> dict:
+    th = tb = start
+    relays = {HEATER: False, PUMP: False}
+    n = int(minutes * 60 / FRAME_S)
+    cycles = {HEATER: 0, PUMP: 0}
+    on_s, reached, tb_max, sq = 0.0, None, -math.inf, []
+    for i in range(n):
+        now = i * FRAME_S
+        meas = lambda v: round((v + rng.normal(0, NOISE_C)) / SENSOR_Q) * SENSOR_Q
+        for pin, on in ctrl.step(meas(tb), meas(th), setpoint, False, now).items():
+            if pin in relays:
+                cycles[pin] += on and not relays[pin]
+                relays[pin] = on
+        th, tb = plant.step(th, tb, float(relays[HEATER]), float(relays[PUMP]), FRAME_S)
+        on_s += FRAME_S * relays[HEATER]
+        tb_max = max(tb_max, tb)
+        if reached is None and tb >= setpoint - 0.5:
+            reached = now
+        if reached is not None:
+            sq.append((tb - setpoint) ** 2)
+    return {"reach_s": reached if reached is not None else math.nan,
+            "overshoot_C": max(0.0, tb_max - setpoint),
+            "heater_cycles": cycles[HEATER], "pump_cycles": cycles[PUMP],
+            "energy_kJ": on_s * HEATER_W / 1000,
+            "rms_C": math.sqrt(np.mean(sq)) if sq else math.nan,
+            "final_C": tb}
+
+
+def perturbed(model: ThermalModel, mismatch: float, rng) -> ThermalModel:
+    p = model.params()
+    return ThermalModel(**{k: v * (1 + rng.uniform(-mismatch, mismatch)) if k != "ta" else v
+                           for k, v in p.items()})
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--setpoint", type=float, default=20.0)
+    ap.add_argument("--start", type=float, default=None, help="initial temps (default: model ambient)")
+    ap.add_argument("--minutes", type=float, default=40.0)
+    ap.add_argument("--mismatch", type=float, default=0.0, help="relative plant / model parameter error")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--fit", metavar="LOG_DIR", help="fit the model from session_*.xlsx and save it")
+    args = ap.parse_args()
+
+    if args.fit:
+        paths = sorted(glob.glob(os.path.join(os.path.expanduser(args.fit), "session_*.xlsx")))
+        model = ThermalModel.fit([session_arrays(p) for p in paths])
+        model.save()
+        print(f"fitted from {len(paths)} sessions: {model}")
+    model = ThermalModel.load()
+    rng = np.random.default_rng(args.seed)
+    plant = perturbed(model, args.mismatch, rng) if args.mismatch else model
+    start = plant.ta if args.start is None else args.start
+    print(f"plant: {plant}\nstart {start:.1f} °C → set-point {args.setpoint:.1f} °C, {args.minutes:g} min\n")
+
+    cols = ("reach_s", "overshoot_C", "heater_cycles", "pump_cycles", "energy_kJ", "rms_C", "final_C")
+    print(f"{'controller':>10}  " + "  ".join(f"{c:>13}" for c in cols))
+    for name, cls in CONTROLLERS.items():
+        ctrl = PredictiveController(model) if cls is PredictiveController else cls()
+        r = simulate(ctrl, plant, args.setpoint, start, args.minutes, np.random.default_rng(args.seed))
+        print(f"{name:>10}  " + "  ".join(f"{r[c]:13.2f}" if isinstance(r[c], float) else f"{r[c]:13d}"
+                                          for c in cols))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Compact telemetry storage codec
+──────────────────────────────────────────────────────────────
+• Every column is stored as scaled integers (fixed point:
+  volts × 1000, °C × 100, …), then delta-of-delta, zigzag and
+  LEB128 varint – slowly changing signals cost ~1 byte/value
+• NaN survives exactly (±inf is stored as NaN): a per-column
+  bitmap, the gap is filled with the previous value so the
+  deltas stay small
+• Rows are written in blocks; each block can be zlib / lzma
+  compressed on top (or stored raw)
+• Encoding and decoding are vectorized NumPy (no per-value
+  Python loop), decoding returns one array per column
+
+File:   b"BMTC" | u32 len | JSON {"version", "columns": [[name, scale], …]}
+        then blocks: b"BLK0" | u32 rows | u8 codec | u32 payload bytes | payload
+Block:  per column: u8 flags | u32 varint bytes | [NaN bitmap] | varints
+──────────────────────────────────────────────────────────────
+"""
+
+import json, lzma, struct, zlib
+import numpy as np
+
+MAGIC, BLOCK = b"BMTC", b"BLK0"
+VERSION = 1
+CODECS = {"none": 0, "zlib": 1, "lzma": 2}
+BLOCK_ROWS = 4096
+
+_BLOCK_HDR = struct.Struct("<4sIBI")
+_COL_HDR = struct.Struct("<BI")
+_HAS_NAN = 1
+
+
+# ── integer packing ───────────────────────────────────────────
+def zigzag(x: np.ndarray) -> np.ndarray:
+    x = x.astype(np.int64)
+    return ((x << 1) ^ (x >> 63)).view(np.uint64)
+
+
+def unzigzag(z: np.ndarray) -> np.ndarray:
+    z = z.astype(np.uint64)
+    return ((z >> np.uint64(1)).view(np.int64)) ^ -(z & np.uint64(1)).view(np.int64)
+
+
+def varint_encode(z: np.ndarray) -> bytes:
+    z = np.asarray(z, dtype=np.uint64)
+    if not len(z):
+        return b""
+    lengths = np.ones(len(z), np.int64)
+    for k in range(1, 10):
+        lengths += z >= np.uint64(1) << np.uint64(7 * k)
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(lengths.sum()), np.uint8)
+    for k in range(int(lengths.max())):
+        sel = lengths > k
+        byte = (z[sel] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        out[starts[sel] + k] = byte.astype(np.uint8) | np.where(lengths[sel] > k + 1, 0x80, 0).astype(np.uint8)
+    return out.tobytes()
+
+
+def varint_decode(buf: bytes, n: int) -> np.ndarray:
+    b = np.frombuffer(buf, np.uint8)
+    ends = np.flatnonzero(b < 0x80)
+    if len(ends) != n:
+        raise ValueError(f"varint stream holds {len(ends)} values, expected {n}")
+    starts = np.concatenate(([0], ends[:-1] + 1))
+    vid = np.repeat(np.arange(n), ends - starts + 1)
+    pos = np.arange(len(b)) - starts[vid]
+    out = np.zeros(n, np.uint64)
+    for k in range(int(pos.max()) + 1 if len(pos) else 0):
+        sel = pos == k
+        out[vid[sel]] |= (b[sel] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+    return out
+
+
+# ── column transforms ─────────────────────────────────────────
+def _encode_column(x: np.ndarray, scale: float) -> bytes:
+    x = np.asarray(x, dtype=float)
+    nan = ~np.isfinite(x)
+    if nan.any():
+        # carry the last finite value forward, so NaN gaps cost no delta
+        idx = np.where(nan, 0, np.arange(len(x)))
+        np.maximum.accumulate(idx, out=idx)
+        x = np.where(nan[idx], 0.0, x[idx])
+    v = np.round(x * scale).astype(np.int64)
+    d = np.diff(v, prepend=0)
+    dd = np.diff(d, prepend=0)
+    stream = varint_encode(zigzag(dd))
+    flags = _HAS_NAN if nan.any() else 0
+    return _COL_HDR.pack(flags, len(stream)) + (np.packbits(nan).tobytes() if flags else b"") + stream
+
+
+def _decode_column(buf: memoryview, off: int, n: int, scale: float):
+    flags, size = _COL_HDR.unpack_from(buf, off); off += _COL_HDR.size
+    nan = None
+    if flags & _HAS_NAN:
+        nb = (n + 7) // 8
+        nan = np.unpackbits(np.frombuffer(buf[off:off + nb], np.uint8), count=n).astype(bool); off += nb
+    dd = unzigzag(varint_decode(buf[off:off + size], n)); off += size
+    x = np.cumsum(np.cumsum(dd)).astype(float) / scale
+    if nan is not None:
+        x[nan] = np.nan
+    return x, off
+
+
+# ── blocks ────────────────────────────────────────────────────
+def encode_block(cols: list, scales: list, codec: str = "zlib") -> bytes:
+    n = len(cols[0]) if cols else 0
+    payload = b"".join(_encode_column(c, s) for c, s in zip(cols, scales))
+    if codec == "zlib":
+        payload = zlib.compress(payload, 6)
+    elif codec == "lzma":
+        payload = lzma.compress(payload, preset=6)
+    return _BLOCK_HDR.pack(BLOCK, n, CODECS[codec], len(payload)) + payload
+
+
+def decode_block(buf, off: int, scales: list):
+    """(list of column arrays, offset after the block)."""
+    tag, n, codec, size = _BLOCK_HDR.unpack_from(buf, off); off += _BLOCK_HDR.size
+    if tag != BLOCK:
+        raise ValueError(f"bad block tag at byte {off - _BLOCK_HDR.size}")
+    payload = bytes(buf[off:off + size]); off += size
+    if codec == CODECS["zlib"]:
+        payload = zlib.decompress(payload)
+    elif codec == CODECS["lzma"]:
+        payload = lzma.decompress(payload)
+    view, p, cols = memoryview(payload), 0, []
+    for s in scales:
+        x, p = _decode_column(view, p, n, s)
+        cols.append(x)
+    return cols, off
+
+
+# ── files ─────────────────────────────────────────────────────
+def flat_columns(dtype: np.dtype, scales: dict = None, default: float = 1000.0) -> list:
+    """[(name, scale)] for a structured dtype; sub-array fields expand to name[i]."""
+    scales, out = scales or {}, []
+    for name in dtype.names:
+        base, shape = dtype[name].base, dtype[name].shape
+        scale = scales.get(name, 1 if base.kind in "biu" else default)
+        names = [f"{name}[{i}]" for i in range(int(np.prod(shape)))] if shape else [name]
+        out += [(n, scale) for n in names]
+    return out
+
+
+class TelemetryWriter:
+    def __init__(self, path: str, columns: list, codec: str = "zlib", block_rows: int = BLOCK_ROWS):
+        """columns: [(name, scale)], e.g. from flat_columns(record_dtype, scales)."""
+        self.columns, self.codec, self.block_rows = columns, codec, block_rows
+        self.f = open(path, "wb")
+        hdr = json.dumps({"version": VERSION, "columns": columns}).encode()
+        self.f.write(MAGIC + struct.pack("<I", len(hdr)) + hdr)
+        self._pending = []
+        self._rows = 0
+
+    def append(self, recs: np.ndarray):
+        """Structured records (or an (n, n_columns) float array)."""
+        if recs.dtype.names:
+            flat = np.column_stack([recs[name].reshape(len(recs), -1).astype(float) for name in recs.dtype.names])
+        else:
+            flat = np.asarray(recs, dtype=float).reshape(len(recs), -1)
+        if flat.shape[1] != len(self.columns):
+            raise ValueError(f"expected {len(self.columns)} columns, got {flat.shape[1]}")
+        self._pending.append(flat); self._rows += len(flat)
+        if self._rows >= self.block_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        block = np.concatenate(self._pending)
+        self.f.write(encode_block(list(block.T), [s for _, s in self.columns], self.codec))
+        self.f.flush()
+        self._pending, self._rows = [], 0
+
+    def close(self):
+        if self.f:
+            self.flush(); self.f.close(); self.f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_telemetry(path: str) -> dict:
+    """{column name: float array} for the whole file."""
+    with open(path, "rb") as f:
+        buf = memoryview(f.read())
+    if bytes(buf[:4]) != MAGIC:
+        raise ValueError(f"{path}: not a telemetry file")
+    (hlen,) = struct.unpack_from("<I", buf, 4)
+    hdr = json.loads(bytes(buf[8:8 + hlen]))
+    names = [n for n, _ in hdr["columns"]]
+    scales = [s for _, s in hdr["columns"]]
+    off, parts = 8 + hlen, []
+    while off < len(buf):
+        try:
+            cols, off = decode_block(buf, off, scales)
+        except (struct.error, ValueError, zlib.error, lzma.LZMAError):
+            break                      # truncated tail (crash mid-write): keep what decoded
+        parts.append(cols)
+    return {n: np.concatenate([p[i] for p in parts]) if parts else np.empty(0)
+            for i, n in enumerate(names)}
+
@@ -2,13 +2,19 @@ import tkinter as tk, time
 from tkinter import ttk
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from visibility import RenderGate
+from scheduler import FrameScheduler, NORMAL
+from bus import FRAMES
 
 class DualTempGraph(tk.Toplevel):
     """
     • Shows Battery & Heater temps in one window
-    • 30 s sliding window, updates via .add_data(batt, heat)
+    • 30 s sliding window, fed from the bus (or .add_data(batt, heat[, t]))
+    • bus frames are plotted at their acquisition time (frame.t),
+      so queue / render delay doesn't bend the time axis
+    • data keeps flowing while minimized; drawing resumes on restore
     """
-    def __init__(self):
+    def __init__(self, bus=None):
         super().__init__()
         self.title("Live Temperatures (30 s window)")
         self.geometry("550x420")
@@ -34,10 +40,15 @@ class DualTempGraph(tk.Toplevel):
         self.min_lbl.pack(side=tk.LEFT,  padx=10)
         self.max_lbl.pack(side=tk.RIGHT, padx=10)
 
-        self.after(500, self._refresh)
+        self.render_gate = RenderGate(self, self._draw)
+        FrameScheduler.for_widget(self).every(500, self._refresh, NORMAL, owner=self)
+        if bus is not None:
+            self.sub = bus.subscribe(FRAMES, lambda f: self.add_data(f.t_batt, f.t_heat, f.t))
+            self.bind("<Destroy>", lambda e: e.widget is self and bus.unsubscribe(self.sub), add="+")
 
-    def add_data(self, batt_val, heat_val):
-        t = time.time() - self.start_t
+    def add_data(self, batt_val, heat_val, t=None):
+        if t is None:
+            t = time.time() - self.start_t
         self.t_data.append(t)
         self.batt.append(batt_val)
         self.heat.append(heat_val)
@@ -49,6 +60,10 @@ class DualTempGraph(tk.Toplevel):
             self.t_data.pop(0); self.batt.pop(0); self.heat.pop(0)
 
     def _refresh(self):
+        if self.t_data:
+            self.render_gate.request()
+
+    def _draw(self):
         if self.t_data:
             self.b_line.set_data(self.t_data, self.batt)
             self.h_line.set_data(self.t_data, self.heat)
@@ -60,4 +75,3 @@ class DualTempGraph(tk.Toplevel):
             self.max_lbl.config(
                 text=f"Max batt: {self.b_max:.1f}°C   "
                      f"Max heat: {self.h_max:.1f}°C")
-        self.after(500, self._refresh)
@@ -0,0 +1,33 @@
+"""python -m pytest -q test_anomaly.py"""
+
+import numpy as np
+
+from anomaly import AnomalyDetector, bms_channels
+
+N_CELLS = 6
+STEADY = [3.70] * N_CELLS + [20.0, 35.5]        # DS18B20 readings on the 0.5 °C grid
+
+
+def run(frames: int, moving=False) -> AnomalyDetector:
+    det = AnomalyDetector(bms_channels(N_CELLS))
+    for _ in range(frames):
+        det.update(STEADY, moving)
+    return det
+
+
+def test_steady_quantized_input_is_not_stuck():
+    det = run(5000)                              # longer than every channel's stuck limit
+    assert not det.any_active()
+
+
+def test_stuck_while_expected_to_move():
+    det = run(3001, moving=True)
+    stuck = det.active[1]
+    assert stuck.all()
+    assert not det.active[[0, 2, 3]].any()
+
+
+def test_stuck_only_on_moving_channels():
+    moving = np.r_[np.zeros(N_CELLS, bool), False, True]    # heater on, pump off
+    det = run(3001, moving)
+    assert [n for n, s in zip(det.names, det.active[1]) if s] == ["t_heat"]
@@ -0,0 +1,108 @@
+"""
+Lumped heater → battery thermal model
+──────────────────────────────────────────────────────────────
+Two nodes, heater loop (Th) and battery (Tb), ambient Ta:
+
+    dTh/dt = p·u − (k0 + kc·pump)(Th − Tb) − la (Th − Ta)
+    dTb/dt = r (k0 + kc·pump)(Th − Tb)     − lb (Tb − Ta)
+
+    u    – heater relay (0/1)      pump – solenoid + pump (0/1)
+    k0   – coupling without circulation, kc – added by the pump
+    r    – heater / battery heat-capacity ratio
+
+• fit(): linear least squares on finite differences of logged
+  sessions (session_*.xlsx: t_s, tBatt, tHeat, Heater, Pump);
+  Ta is taken as each session's starting battery temperature
+• step() is vectorized, so a controller can roll many candidate
+  plans forward at once
+• Parameters live in thermal_model.json; none is shipped, so
+  until `python sim_autopilot.py --fit LOG_DIR` has been run
+  the model is just DEFAULTS (a plausible guess, not this rig)
+──────────────────────────────────────────────────────────────
+"""
+
+import json, os
+import numpy as np
+
+MODEL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thermal_model.json")
+PARAMS = ("p", "k0", "kc", "la", "r", "lb", "ta")
+
+# plausible starting point until a session has been fitted (°C, s)
+DEFAULTS = {"p": 0.25, "k0": 0.002, "kc": 0.02, "la": 0.003, "r": 0.3, "lb": 0.0005, "ta": 5.0}
+
+
+class ThermalModel:
+    def __init__(self, **params):
+        for k in PARAMS:
+            setattr(self, k, float(params.get(k, DEFAULTS[k])))
+
+    def __repr__(self):
+        return "ThermalModel(" + ", ".join(f"{k}={getattr(self, k):.4g}" for k in PARAMS) + ")"
+
+    def params(self) -> dict:
+        return {k: getattr(self, k) for k in PARAMS}
+
+    def derivs(self, th, tb, u, pump):
+        flow = (self.k0 + self.kc * pump) * (th - tb)
+        return (self.p * u - flow - self.la * (th - self.ta),
+                self.r * flow - self.lb * (tb - self.ta))
+
+    def step(self, th, tb, u, pump, dt: float):
+        """One explicit-Euler step; th / tb / u / pump may be arrays."""
+        dth, dtb = self.derivs(th, tb, u, pump)
+        return th + dth * dt, tb + dtb * dt
+
+    # ── persistence ───────────────────────────────────────────
+    @classmethod
+    def load(cls, path: str = MODEL_FILE) -> "ThermalModel":
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r") as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str = MODEL_FILE):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.params(), f, indent=2)
+        os.replace(tmp, path)
+
+    # ── fitting ───────────────────────────────────────────────
+    @classmethod
+    def fit(cls, sessions: list, min_dt: float = 0.05) -> "ThermalModel":
+        """sessions: [{"t", "tb", "th", "u", "pump"} arrays]; ambient = each session's first tb."""
+        A_h, b_h, A_b, b_b = [], [], [], []
+        tas = []
+        for s in sessions:
+            t, tb, th, u, pump = (np.asarray(s[k], dtype=float) for k in ("t", "tb", "th", "u", "pump"))
+            ok = np.isfinite(tb) & np.isfinite(th) & np.isfinite(t)
+            t, tb, th, u, pump = t[ok], tb[ok], th[ok], u[ok], pump[ok]
+            if len(t) < 10:
+                continue
+            ta = tb[0]; tas.append(ta)
+            dt = np.diff(t)
+            keep = dt > min_dt
+            dth, dtb = np.diff(th)[keep] / dt[keep], np.diff(tb)[keep] / dt[keep]
+            d = (th - tb)[:-1][keep]
+            th0, tb0, u0, p0 = th[:-1][keep], tb[:-1][keep], u[:-1][keep], pump[:-1][keep]
+            # dTh/dt = p·u − k0·d − kc·pump·d − la·(Th − Ta)
+            A_h.append(np.column_stack([u0, -d, -p0 * d, -(th0 - ta)])); b_h.append(dth)
+            # dTb/dt = (r·k0)·d + (r·kc)·pump·d − lb·(Tb − Ta)
+            A_b.append(np.column_stack([d, p0 * d, -(tb0 - ta)])); b_b.append(dtb)
+        if not A_h:
+            raise ValueError("no usable session data to fit")
+        (p, k0, kc, la), *_ = np.linalg.lstsq(np.vstack(A_h), np.concatenate(b_h), rcond=None)
+        (rk0, rkc, lb), *_ = np.linalg.lstsq(np.vstack(A_b), np.concatenate(b_b), rcond=None)
+        # r is over-determined (from k0 and kc); weight by the better-excited term
+        r = rkc / kc if abs(kc) > abs(k0) else rk0 / k0 if k0 else DEFAULTS["r"]
+        clip = lambda v: max(float(v), 1e-6)
+        return cls(p=clip(p), k0=clip(k0), kc=clip(kc), la=clip(la), r=clip(r), lb=clip(lb),
+                   ta=float(np.mean(tas)))
+
+
+def session_arrays(path: str) -> dict:
+    """Fit input from one dashboard Excel log."""
+    from session_tool import read_session
+    _, col = read_session(path)
+    nan = np.full(len(col.get("t_s", ())), np.nan)
+    return {"t": col.get("t_s", nan), "tb": col.get("tBatt", nan), "th": col.get("tHeat", nan),
+            "u": np.nan_to_num(col.get("Heater", nan)), "pump": np.nan_to_num(col.get("Pump", nan))}
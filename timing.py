@@ -0,0 +1,87 @@
+"""
+Device timestamps and latency statistics
+──────────────────────────────────────────────────────────────
+• ClockSync: maps the board's millis() onto host time.
+  offset = min(t_recv − t_dev) over a sliding window – the
+  frame with the least transit delay pins the offset, so
+  queueing jitter never moves the time axis; the window lets
+  it follow crystal drift. Handles the 49-day millis() wrap
+  and restarts after a board reset.
+  t_acq = t_dev + offset ≤ t_recv, so latencies are measured
+  relative to the fastest observed transit
+• LatencyHistogram: log-spaced bins (0.1 ms … 10 s) per stage,
+  O(1) memory, percentiles from the cumulative counts
+──────────────────────────────────────────────────────────────
+"""
+
+from collections import deque
+import numpy as np
+
+SYNC_WINDOW = 600           # frames (~1 min at 10 Hz)
+MILLIS_WRAP = 2 ** 32
+
+HIST_EDGES = np.logspace(-4, 1, 101)        # seconds
+STAGES = ("transport", "display", "total")  # acq→recv, recv→disp, acq→disp
+
+
+class ClockSync:
+    def __init__(self, window: int = SYNC_WINDOW):
+        self.window = window
+        self.resets = 0             # board reboots seen (millis() went backwards)
+        self.reset()
+
+    def reset(self):
+        self._mins = deque()        # (index, offset), offsets increasing → front is the min
+        self._i = 0
+        self._last_ms = None
+        self._wraps = 0
+
+    def to_host(self, dev_ms: float, t_recv: float) -> float:
+        """Acquisition time (host clock) of a frame stamped dev_ms, received at t_recv."""
+        if self._last_ms is not None and dev_ms < self._last_ms:
+            if self._last_ms - dev_ms > MILLIS_WRAP // 2:
+                self._wraps += 1
+            else:                                   # board rebooted
+                self.reset(); self.resets += 1
+        self._last_ms = dev_ms
+        t_dev = (dev_ms + self._wraps * MILLIS_WRAP) / 1000.0
+        off = t_recv - t_dev
+        q = self._mins
+        while q and q[-1][1] >= off:
+            q.pop()
+        q.append((self._i, off))
+        while q[0][0] <= self._i - self.window:
+            q.popleft()
+        self._i += 1
+        return t_dev + q[0][1]
+
+    @property
+    def offset(self) -> float:
+        return self._mins[0][1] if self._mins else float("nan")
+
+
+class LatencyHistogram:
+    def __init__(self, edges: np.ndarray = HIST_EDGES, stages=STAGES):
+        self.edges = edges
+        self.counts = {s: np.zeros(len(edges) + 1, np.int64) for s in stages}  # + under / overflow
+
+    def add(self, stage: str, latencies):
+        lat = np.asarray(latencies, dtype=float)
+        lat = lat[np.isfinite(lat)]
+        np.add.at(self.counts[stage], np.searchsorted(self.edges, lat), 1)
+
+    def total(self, stage: str) -> int:
+        return int(self.counts[stage].sum())
+
+    def percentile(self, stage: str, q: float) -> float:
+        """Upper bin edge holding the q-th percentile (seconds), NaN if empty."""
+        c = self.counts[stage]
+        n = c.sum()
+        if not n:
+            return float("nan")
+        i = int(np.searchsorted(np.cumsum(c), q / 100 * n))
+        return float(self.edges[min(i, len(self.edges) - 1)])
+
+    def clear(self):
+        for c in self.counts.values():
+            c[:] = 0
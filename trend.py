@@ -0,0 +1,93 @@
+"""
+Streaming least-squares trend estimator
+──────────────────────────────────────────────────────────────
+• Sliding linear regression over a time-based window
+• Running sums (n, Σx, Σy, Σx², Σxy, Σy²) → O(1) per sample,
+  independent of the window length
+• slope = dV/dt, t_stat = |slope| / standard error,
+  eta() = seconds until the fitted line reaches a target
+──────────────────────────────────────────────────────────────
+"""
+
+import math
+from collections import deque
+
+MIN_T_STAT = 2.0
+
+
+class TrendEstimator:
+    def __init__(self, window_s: float = 3.0):
+        self.window_s = window_s
+        self._buf = deque()
+        self._t_ref = None
+        self._zero()
+
+    def _zero(self):
+        self.n = 0
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+
+    def _acc(self, x, y, sign):
+        self.n += sign
+        self.sx += sign * x; self.sy += sign * y
+        self.sxx += sign * x * x; self.sxy += sign * x * y; self.syy += sign * y * y
+
+    def add(self, t: float, v: float):
+        if not math.isfinite(v):
+            return
+        if self._t_ref is None:
+            self._t_ref = t
+        x = t - self._t_ref
+        self._buf.append((x, v)); self._acc(x, v, +1)
+        while self._buf and x - self._buf[0][0] > self.window_s:
+            self._acc(*self._buf.popleft(), -1)
+        # re-centre now and then so the sums don't lose precision as t grows
+        if self._buf[0][0] > 1000 * self.window_s:
+            self._rebase()
+
+    def _rebase(self):
+        x0 = self._buf[0][0]
+        self._t_ref += x0
+        self._buf = deque((x - x0, y) for x, y in self._buf)
+        self._zero()
+        for x, y in self._buf: self._acc(x, y, +1)
+
+    @property
+    def slope(self) -> float:
+        """dV/dt in units per second (0 until two distinct samples)."""
+        den = self.n * self.sxx - self.sx * self.sx
+        return (self.n * self.sxy - self.sx * self.sy) / den if den > 1e-12 else 0.0
+
+    @property
+    def t_stat(self) -> float:
+        """|slope| / standard error of the slope (confidence of the trend)."""
+        if self.n < 3: return 0.0
+        sxx_c = self.sxx - self.sx * self.sx / self.n
+        if sxx_c <= 1e-12: return 0.0
+        b = self.slope
+        a = (self.sy - b * self.sx) / self.n
+        sse = max(self.syy - a * self.sy - b * self.sxy, 0.0)
+        se = math.sqrt(sse / (self.n - 2) / sxx_c)
+        return abs(b) / se if se > 0 else math.inf
+
+    def fitted_now(self) -> float:
+        if not self._buf: return math.nan
+        b = self.slope
+        a = (self.sy - b * self.sx) / self.n
+        return a + b * self._buf[-1][0]
+
+    def trend(self, rate_thresh: float, min_t: float = MIN_T_STAT) -> str:
+        if not self.ready(): return "flat"
+        b = self.slope
+        if abs(b) <= rate_thresh or self.t_stat < min_t: return "flat"
+        return "up" if b > 0 else "down"
+
+    def ready(self) -> bool:
+        """True once the buffer spans most of the window."""
+        return len(self._buf) >= 3 and self._buf[-1][0] - self._buf[0][0] >= 0.8 * self.window_s
+
+    def eta(self, target: float) -> float:
+        """Seconds until the fitted line reaches `target` (inf if moving away / flat)."""
+        b = self.slope
+        if b == 0: return math.inf
+        dt = (target - self.fitted_now()) / b
+        return dt if dt >= 0 else math.inf
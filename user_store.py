@@ -0,0 +1,140 @@
+"""
+Operator credential store
+──────────────────────────────────────────────────────────────
+• JsonUserStore   – users.json kept in memory, reloaded only
+                    when the file's mtime/size changes; writes
+                    go to a temp file + os.replace under an
+                    exclusive lock, so concurrent registrations
+                    can't lose or corrupt entries
+• SqliteUserStore – same interface on SQLite for big rosters
+• open_user_store(path) picks the backend from the extension
+──────────────────────────────────────────────────────────────
+"""
+
+import json, os, sqlite3, tempfile, threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:          # Windows
+    fcntl = None
+    import msvcrt
+
+USERS_FILE = "users.json"
+
+
+@contextmanager
+def _file_lock(path: str):
+    with open(path + ".lock", "a+") as lf:
+        if fcntl:
+            fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+        else:
+            lf.seek(0); msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+            else:
+                lf.seek(0); msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class JsonUserStore:
+    def __init__(self, path: str = USERS_FILE):
+        self.path = path
+        self._users = {}
+        self._stamp = None
+        self._mutex = threading.Lock()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return
+        users = {}
+        if stamp is not None:
+            with open(self.path, "r") as f:
+                users = json.load(f)
+        self._users, self._stamp = users, stamp
+
+    def get(self, username: str):
+        with self._mutex:
+            self._refresh()
+            return self._users.get(username)
+
+    def __contains__(self, username: str) -> bool:
+        return self.get(username) is not None
+
+    def __len__(self) -> int:
+        with self._mutex:
+            self._refresh()
+            return len(self._users)
+
+    def add(self, username: str, record: dict) -> bool:
+        """Insert a new user; False if the name is already taken."""
+        with self._mutex, _file_lock(self.path):
+            self._refresh()
+            if username in self._users:
+                return False
+            users = dict(self._users)
+            users[username] = record
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)),
+                                       prefix=".users-", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(users, f)
+                    f.flush(); os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                if os.path.exists(tmp): os.remove(tmp)
+                raise
+            self._users, self._stamp = users, self._stat()
+            return True
+
+
+class SqliteUserStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._mutex = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS users ("
+                         "username TEXT PRIMARY KEY, salt TEXT NOT NULL, hash TEXT NOT NULL)")
+        self._db.commit()
+
+    def get(self, username: str):
+        with self._mutex:
+            row = self._db.execute("SELECT salt, hash FROM users WHERE username = ?",
+                                   (username,)).fetchone()
+        return {"salt": row[0], "hash": row[1]} if row else None
+
+    def __contains__(self, username: str) -> bool:
+        return self.get(username) is not None
+
+    def __len__(self) -> int:
+        with self._mutex:
+            return self._db.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def add(self, username: str, record: dict) -> bool:
+        with self._mutex, self._db:
+            cur = self._db.execute("INSERT OR IGNORE INTO users (username, salt, hash) VALUES (?, ?, ?)",
+                                   (username, record["salt"], record["hash"]))
+        return cur.rowcount == 1
+
+    def import_json(self, json_path: str = USERS_FILE) -> int:
+        """Copy every user from a users.json file; returns how many were new."""
+        with open(json_path, "r") as f:
+            users = json.load(f)
+        return sum(self.add(name, rec) for name, rec in users.items())
+
+
+def open_user_store(path: str = USERS_FILE):
+    if os.path.splitext(path)[1].lower() in (".db", ".sqlite", ".sqlite3"):
+        return SqliteUserStore(path)
+    return JsonUserStore(path)
@@ -0,0 +1,48 @@
+"""
+Visibility-aware rendering
+──────────────────────────────────────────────────────────────
+• is_shown(widget): mapped, all ancestors mapped, and its
+  toplevel isn't minimized / withdrawn
+• RenderGate: call request() whenever new data arrived; the
+  render runs only while the widget is shown, otherwise the
+  gate remembers it is stale and renders once from the
+  latest state when the widget (or its window) maps again
+──────────────────────────────────────────────────────────────
+"""
+
+import tkinter as tk
+
+
+def is_shown(widget) -> bool:
+    try:
+        return bool(widget.winfo_viewable()) and \
+            widget.winfo_toplevel().state() not in ("iconic", "withdrawn")
+    except tk.TclError:          # destroyed
+        return False
+
+
+class RenderGate:
+    def __init__(self, widget, render):
+        self.widget, self.render = widget, render
+        self.stale = self._pending = False
+        widget.bind("<Map>", self._on_map, add="+")
+        if widget.winfo_toplevel() is not widget:
+            widget.winfo_toplevel().bind("<Map>", self._on_map, add="+")
+
+    def request(self):
+        if is_shown(self.widget):
+            self.stale = False
+            self.render()
+        else:
+            self.stale = True
+
+    def _on_map(self, _event=None):
+        # Map fires for every child too; catch up once per burst
+        if self.stale and not self._pending:
+            self._pending = True
+            self.widget.after_idle(self._flush)
+
+    def _flush(self):
+        self._pending = False
+        if self.stale:
+            self.request()